@@ -1,15 +1,77 @@
+import functools
+import os
+import time
+
 import streamlit as st
-import pandas as pd
+
+from recruitment.canonical import load_aliases
+from recruitment.cube import RecruitmentCube
+from recruitment.export import (
+    EXPORT_FORMATS, EXPORT_MIME, ExportCache, ExportScope, export_file_name, scope_label,
+)
+from recruitment.helpers import (
+    filter_items, format_age, get_region_name, pack_button_rows,
+)
+from recruitment.perf import JsonLinesSink, RerunTrace
+from recruitment.search import SearchIndex
+from recruitment.sources import DEFAULT_SHEET_URL, open_source
+from recruitment.store import SnapshotStore
+from recruitment.viewmodels import NO_POSITIONS, ViewModelCache, staff_headings
 
 # --- Configuration ---
 st.set_page_config(page_title="XAD Recruitment Details", layout="wide")
 
 # --- Constants ---
 # Google Sheet Export URL (CSV format)
-SHEET_URL = "https://docs.google.com/spreadsheets/d/1HDXLPqdZh3FlK_dmLzi-TzgPMNh9CLk_eMJjLK5g-uY/export?format=csv&gid=249760352"
+SHEET_URL = DEFAULT_SHEET_URL
+
+# Override with a local .csv/.xlsx path, another URL, or a comma-separated list of them (one per tab)
+DATA_SOURCE = os.environ.get("XAD_DATA_SOURCE", SHEET_URL)
+
+# Seconds before the sheet is revalidated in the background (0 disables auto refresh)
+REFRESH_INTERVAL = int(os.environ.get("XAD_REFRESH_INTERVAL", "600"))
+
+# Last good snapshot is kept here for instant cold starts and offline use (empty disables it)
+SNAPSHOT_CACHE_DIR = os.environ.get(
+    "XAD_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshot_cache")
+)
+
+# Rows per chunk when streaming the export in (0 parses it in one go)
+INGEST_CHUNK_ROWS = int(os.environ.get("XAD_CHUNK_ROWS", "50000"))
+
+# JSON file of extra spellings merged into one canonical value (see recruitment.canonical)
+ALIASES_FILE = os.environ.get("XAD_ALIASES", "")
+
+# Buttons per page in long button grids; the rest sit behind "Show more" and a filter
+BUTTON_PAGE_SIZE = int(os.environ.get("XAD_BUTTON_PAGE_SIZE", "60"))
+
+# Heuristic: Approximate max characters per row of buttons before wrapping
+BUTTON_ROW_CHARS = 80
+
+# Home/Region/Staff view models kept in memory, shared by all sessions
+VIEW_CACHE_SIZE = int(os.environ.get("XAD_VIEW_CACHE_SIZE", "256"))
+
+# Memory for encoded CSV/XLSX downloads, shared by all sessions
+EXPORT_CACHE_MB = int(os.environ.get("XAD_EXPORT_CACHE_MB", "64"))
+
+# Results listed under the sidebar search box
+SEARCH_RESULT_LIMIT = 15
+
+# Append per-rerun timings to this JSON-lines file (empty disables it)
+PERF_LOG = os.environ.get("XAD_PERF_LOG", "")
+
+# --- Instrumentation ---
+@st.cache_resource
+def get_perf_sink():
+    return JsonLinesSink(PERF_LOG) if PERF_LOG else None
+
+# Opt-in sidebar panel: XAD_PERF_PANEL=1, or ?perf=1 in the URL
+PERF_PANEL = os.environ.get("XAD_PERF_PANEL") == "1" or st.query_params.get("perf") == "1"
+trace = RerunTrace(enabled=PERF_PANEL or bool(PERF_LOG), sink=get_perf_sink())
 
 # --- CSS Styling ---
-st.markdown("""
+with trace.stage("css"):
+    st.markdown("""
     <style>
     /* 1. Dynamic Button Sizing */
     div[data-testid="stColumn"] div[data-testid="stColumn"] {
@@ -56,17 +118,6 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# --- Mappings ---
-REGION_MAPPING = {
-    "UAE": "United Arab Emirates",
-    "KSA": "Kingdom of Saudi Arabia",
-    "UK": "United Kingdom",
-    "Unspecified Region": "Unspecified Region"
-}
-
-def get_region_name(acronym):
-    return REGION_MAPPING.get(acronym, acronym)
-
 # --- Session State ---
 if 'view_mode' not in st.session_state:
     st.session_state.view_mode = 'Home'
@@ -95,6 +146,14 @@ def go_home():
     st.session_state.selected_region = None
     st.session_state.selected_staff = None
     reset_drill_down()
+    write_nav_params()
+
+def go_to_summary():
+    st.session_state.view_mode = 'Summary'
+    st.session_state.selected_region = None
+    st.session_state.selected_staff = None
+    reset_drill_down()
+    write_nav_params()
 
 def go_to_region(region_name):
     if st.session_state.selected_region != region_name:
@@ -102,6 +161,7 @@ def go_to_region(region_name):
     st.session_state.view_mode = 'Region'
     st.session_state.selected_region = region_name
     st.session_state.selected_staff = None
+    write_nav_params()
 
 def go_to_staff(staff_name):
     if st.session_state.selected_staff != staff_name:
@@ -109,106 +169,153 @@ def go_to_staff(staff_name):
     st.session_state.view_mode = 'Staff'
     st.session_state.selected_staff = staff_name
     st.session_state.selected_region = None
-
-def sort_staff_list(staff_list):
+    write_nav_params()
+
+# --- URL State ---
+# The navigation state is mirrored into query parameters so every page can be
+# bookmarked or shared, e.g. ?view=region&region=UAE&project=Metro&subdiv=Line+1
+# or ?view=staff&staff=Alice&open=UAE|Tower|Tower
+NAV_PARAMS = ("view", "region", "project", "subdiv", "staff", "open")
+
+def write_nav_params():
+    state = st.session_state
+    params = {}
+    if state.view_mode == 'Region':
+        params = {
+            "view": "region",
+            "region": state.selected_region,
+            "project": state.reg_selected_project,
+            "subdiv": state.reg_selected_subdiv,
+        }
+    elif state.view_mode == 'Staff':
+        params = {
+            "view": "staff",
+            "staff": state.selected_staff,
+            "open": state.staff_selected_subdiv_key,
+        }
+    elif state.view_mode == 'Summary':
+        params = {"view": "summary"}
+
+    for key in NAV_PARAMS:
+        value = params.get(key)
+        if value is None:
+            if key in st.query_params:
+                del st.query_params[key]
+        elif st.query_params.get(key) != value:
+            st.query_params[key] = value
+
+def read_nav_params():
+    params = st.query_params
+    view = params.get("view")
+    if view == "region" and params.get("region"):
+        st.session_state.view_mode = 'Region'
+        st.session_state.selected_region = params["region"]
+        st.session_state.reg_selected_project = params.get("project")
+        st.session_state.reg_selected_subdiv = params.get("subdiv")
+    elif view == "staff" and params.get("staff"):
+        st.session_state.view_mode = 'Staff'
+        st.session_state.selected_staff = params["staff"]
+        st.session_state.staff_selected_subdiv_key = params.get("open")
+    elif view == "summary":
+        st.session_state.view_mode = 'Summary'
+
+def validate_nav_state(index):
     """
-    Pins 'Manager Required' to top.
-    Pins 'Unspecified' to bottom.
-    Sorts rest alphabetically.
+    Drops navigation state the snapshot does not know, from a hand-edited link
+    or a refresh that removed it. An unknown region or staff member falls back
+    to Home; an unknown project, sub-division or open placement is cleared.
+    The query parameters are rewritten to match.
     """
-    unique_staff = sorted(list(set(staff_list)))
-    
-    special_top = []
-    if "Manager Required" in unique_staff:
-        unique_staff.remove("Manager Required")
-        special_top.append("Manager Required")
-        
-    special_bottom = []
-    if "Unspecified" in unique_staff:
-        unique_staff.remove("Unspecified")
-        special_bottom.append("Unspecified")
-        
-    return special_top + unique_staff + special_bottom
-
-def sort_region_list(region_list):
-    """Pins 'Unspecified Region' to bottom."""
-    unique = sorted(list(set(region_list)))
-    if "Unspecified Region" in unique:
-        unique.remove("Unspecified Region")
-        unique.append("Unspecified Region")
-    return unique
-
-def sort_general_list(item_list):
-    """Pins 'Unspecified' to bottom for Projects/Sub-divs."""
-    unique = sorted(list(set(item_list)))
-    if "Unspecified" in unique:
-        unique.remove("Unspecified")
-        unique.append("Unspecified")
-    return unique
-
-def format_staff_for_display(staff_list):
-    """
-    Formats staff list for the 'Supervising Staff' line.
-    Removes 'Manager Required'.
-    Returns (formatted_string, boolean_is_manager_required)
-    """
-    clean_list = sorted(list(set(staff_list)))
-    is_mgr_req = False
-    
-    if "Manager Required" in clean_list:
-        clean_list.remove("Manager Required")
-        is_mgr_req = True
-        
-    if not clean_list:
-        return "None", is_mgr_req
-        
-    if len(clean_list) == 1:
-        return clean_list[0], is_mgr_req
-        
-    return ", ".join(clean_list[:-1]) + " and " + clean_list[-1], is_mgr_req
-
-def is_global_simple_project(full_df, region, project_name):
-    subset = full_df[(full_df['Region'] == region) & (full_df['Project'] == project_name)]
-    if subset.empty: return False
-    unique_subs = subset['Sub_Division'].unique()
-    return (len(unique_subs) == 1) and (unique_subs[0] == project_name)
+    state = st.session_state
+    if state.view_mode == 'Region':
+        region = state.selected_region
+        projects = index.region_projects(region)
+        if not projects:
+            go_home()
+            return
+        project, subdiv = state.reg_selected_project, state.reg_selected_subdiv
+        if project is not None and project not in projects:
+            project = subdiv = None
+        if subdiv is not None and (project is None or subdiv not in index.subdivisions(region, project)):
+            subdiv = None
+        if (project, subdiv) != (state.reg_selected_project, state.reg_selected_subdiv):
+            state.reg_selected_project, state.reg_selected_subdiv = project, subdiv
+            write_nav_params()
+    elif state.view_mode == 'Staff':
+        staff = state.selected_staff
+        if not index.staff_regions(staff):
+            go_home()
+            return
+        key = state.staff_selected_subdiv_key
+        if key is not None and tuple(key.split('|')) not in index.staff_placements(staff):
+            state.staff_selected_subdiv_key = None
+            write_nav_params()
+
+# Deep links: the first run of a session renders the page encoded in the URL directly
+if 'nav_from_url' not in st.session_state:
+    st.session_state.nav_from_url = True
+    read_nav_params()
 
 # --- Dynamic Button Layout Engine ---
-def render_dynamic_buttons(items, key_prefix, selected_val, on_click_action):
-    if not items: return
+def show_more_buttons(key, page_size):
+    st.session_state[key] += page_size
 
-    # Heuristic: Approximate max characters per row before wrapping
-    MAX_CHARS_PER_ROW = 80 
-    
-    rows = []
-    current_row = []
-    current_len = 0
-    
-    for item in items:
-        # Estimate length: chars + padding buffer
-        item_len = len(str(item)) + 6 
-        
-        if current_len + item_len > MAX_CHARS_PER_ROW and current_row:
-            rows.append(current_row)
-            current_row = []
-            current_len = 0
-        
-        current_row.append(item)
-        current_len += item_len
-        
-    if current_row:
-        rows.append(current_row)
+def render_dynamic_buttons(items, key_prefix, selected_val, on_click_action, page_size=None, filterable=True,
+                           new_items=()):
+    """
+    Renders items as packed rows of buttons, one page at a time. Items in
+    new_items get the NEW_BADGE in their label.
 
-    # Render Rows
-    for r_idx, row_items in enumerate(rows):
-        cols = st.columns(len(row_items))
+    Lists longer than page_size get a type-ahead filter (when filterable) and
+    a "Show more" button, so the widget count stays bounded however long the
+    list is. The selected item is always rendered, even past the current page.
+    """
+    if not items: return
+    items = tuple(items)
+    page_size = page_size or BUTTON_PAGE_SIZE
+
+    with trace.stage("render_dynamic_buttons"):
+        paginated = len(items) > page_size
+        if paginated and filterable:
+            query = st.text_input(
+                "Filter", key=f"{key_prefix}_filter", placeholder=f"Filter {len(items)} items...",
+                label_visibility="collapsed",
+            )
+            items = filter_items(items, query)
+            if not items:
+                st.caption("No matches.")
+                return
+
+        shown_key = f"{key_prefix}_shown"
+        if shown_key not in st.session_state:
+            st.session_state[shown_key] = page_size
+        visible = items[:st.session_state[shown_key]] if paginated else items
+        if selected_val is not None and selected_val not in visible and selected_val in items:
+            visible += (selected_val,)
+
+        trace.count("widgets", len(visible))
+        rows = pack_button_rows(visible, BUTTON_ROW_CHARS)
+
+        # Render Rows
+        for r_idx, row_items in enumerate(rows):
+            cols = st.columns(len(row_items))
         
-        for c_idx, item in enumerate(row_items):
-            is_active = (selected_val == item)
-            btn_type = "primary" if is_active else "secondary"
+            for c_idx, item in enumerate(row_items):
+                is_active = (selected_val == item)
+                btn_type = "primary" if is_active else "secondary"
             
-            if cols[c_idx].button(item, key=f"{key_prefix}_{r_idx}_{c_idx}", type=btn_type):
-                on_click_action(item)
+                label = f"{NEW_BADGE} {item}" if item in new_items else item
+                cols[c_idx].button(
+                    label, key=f"{key_prefix}_{r_idx}_{c_idx}", type=btn_type,
+                    on_click=on_click_action, args=(item,),
+                )
+
+        remaining = len(items) - len(visible)
+        if paginated and remaining > 0:
+            st.button(
+                f"Show more ({remaining} more)", key=f"{key_prefix}_more",
+                on_click=show_more_buttons, args=(shown_key, page_size),
+            )
 
 # --- Navigation Callbacks ---
 def on_region_jump():
@@ -223,83 +330,386 @@ def on_staff_jump():
         go_to_staff(val)
         st.session_state.nav_staff_jump = "Select..."
 
-# --- Data Loading & Cleaning ---
-@st.cache_data
-def load_data():
-    try:
-        # Read all as string initially to avoid type errors
-        df = pd.read_csv(SHEET_URL, dtype=str)
-        
-        # Strip whitespace from headers
-        df.columns = [str(c).strip() for c in df.columns]
-        
-        # 1. Handle Regions
-        df['Region'] = df['Region'].fillna("Unspecified Region")
-        df.loc[df['Region'].str.strip() == '', 'Region'] = "Unspecified Region"
-        
-        # 2. Handle Staff
-        df['Staff_Lead'] = df['Staff_Lead'].fillna("Unspecified")
-        df.loc[df['Staff_Lead'].str.strip() == '', 'Staff_Lead'] = "Unspecified"
-        
-        # 3. Handle Role
-        df['Role'] = df['Role'].fillna("Unspecified")
-        df.loc[df['Role'].str.strip() == '', 'Role'] = "Unspecified"
-        
-        # 4. Handle Project & Sub-Division Logic
-        # Fill NaNs with empty string temporary for easier logic
-        df['Project'] = df['Project'].fillna("")
-        df['Sub_Division'] = df['Sub_Division'].fillna("")
-        
-        # Logic: If both empty -> Unspecified
-        mask_both_empty = (df['Project'] == "") & (df['Sub_Division'] == "")
-        df.loc[mask_both_empty, 'Project'] = "Unspecified"
-        df.loc[mask_both_empty, 'Sub_Division'] = "Unspecified"
-        
-        # Logic: If Project has val, Sub is empty -> Sub = Project
-        mask_proj_ok_sub_empty = (df['Project'] != "") & (df['Sub_Division'] == "")
-        df.loc[mask_proj_ok_sub_empty, 'Sub_Division'] = df.loc[mask_proj_ok_sub_empty, 'Project']
-        
-        # Logic: If Sub has val, Proj is empty -> Proj = Sub
-        mask_sub_ok_proj_empty = (df['Sub_Division'] != "") & (df['Project'] == "")
-        df.loc[mask_sub_ok_proj_empty, 'Project'] = df.loc[mask_sub_ok_proj_empty, 'Sub_Division']
+SUMMARY_COLUMNS = {
+    "Staff_Lead": "Staff Lead",
+    "Sub_Division": "Sub-division",
+    "positions": "Open Positions",
+    "projects": "Projects",
+    "sub_divisions": "Sub-divisions",
+    "staff": "Staff",
+    "regions": "Regions",
+    "manager_required": "Manager Required",
+}
+
+NEW_BADGE = "🆕"
+
+SEARCH_ICONS = {"region": "🌍", "staff": "👤", "project": "📁", "sub_division": "📂", "role": "💼"}
+
+def open_search_hit(hit):
+    if hit.staff is not None:
+        go_to_staff(hit.staff)
+        return
+    go_to_region(hit.region)
+    st.session_state.reg_selected_project = hit.project
+    st.session_state.reg_selected_subdiv = hit.subdiv
+    write_nav_params()
+
+# --- Drill-Down Callbacks ---
+# Run as on_click callbacks, before the next (fragment) rerun, so no extra st.rerun() is needed.
+def toggle_reg_project(p_name):
+    if st.session_state.reg_selected_project == p_name:
+        st.session_state.reg_selected_project = None
+    else:
+        st.session_state.reg_selected_project = p_name
+    st.session_state.reg_selected_subdiv = None
+    write_nav_params()
+
+def toggle_reg_subdiv(sd_name):
+    if st.session_state.reg_selected_subdiv == sd_name:
+        st.session_state.reg_selected_subdiv = None
+    else:
+        st.session_state.reg_selected_subdiv = sd_name
+    write_nav_params()
+
+def toggle_staff_subdiv(region_code, proj, sd_name):
+    key = f"{region_code}|{proj}|{sd_name}"
+    if st.session_state.staff_selected_subdiv_key == key:
+        st.session_state.staff_selected_subdiv_key = None
+    else:
+        st.session_state.staff_selected_subdiv_key = key
+    write_nav_params()
+
+def toggle_staff_simple(region_code, p_name):
+    toggle_staff_subdiv(region_code, p_name, p_name)
+
+def role_line(role, role_key, staff=None):
+    """
+    Bullet for one role, badged if highlighting is on and the last refresh
+    added it (to the given staff member's placement, on the Staff view).
+    """
+    if highlight is None:
+        is_new = False
+    elif staff is None:
+        is_new = role_key in highlight.new_roles
+    else:
+        is_new = (staff, *role_key) in highlight.new_staff_roles
+    return f"- {NEW_BADGE} {role}" if is_new else f"- {role}"
+
+# --- Exports ---
+def render_export_buttons(scope, key_prefix):
+    """CSV and XLSX downloads of a scope; the file is only encoded when a button is clicked."""
+    st.caption(f"Export: {scope_label(scope)}")
+    cols = st.columns(len(EXPORT_FORMATS))
+    for col, fmt in zip(cols, EXPORT_FORMATS):
+        col.download_button(
+            f"⬇️ {fmt.upper()}",
+            # Called on a separate thread at download time, not during the rerun
+            data=functools.partial(exports.get, snapshot, scope, fmt),
+            file_name=export_file_name(scope, fmt),
+            mime=EXPORT_MIME[fmt],
+            key=f"{key_prefix}_{fmt}",
+            on_click="ignore",
+            use_container_width=True,
+        )
+
+# --- Drill-Down Fragments ---
+# Clicks inside a fragment rerun only that fragment: the CSS, sidebar and
+# data loading of the page stay as they are.
+def traced_fragment(func):
+    """
+    Times a fragment. Run inline by a full rerun, it is a stage of that run's
+    trace. Rerun on its own (the full run's trace is finished by then), it
+    gets a trace of its own, tagged with the fragment, which goes to the perf
+    log and is kept for the panel of the next full run.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global trace
+        if not trace.finished:
+            with trace.stage(func.__name__):
+                return func(*args, **kwargs)
+
+        trace = RerunTrace(
+            enabled=trace.enabled, sink=get_perf_sink(),
+            view=st.session_state.view_mode, fragment=func.__name__,
+        )
+        with trace.stage(func.__name__):
+            result = func(*args, **kwargs)
+        record = trace.finish()
+        if record is not None:
+            st.session_state.perf_last_fragment = record
+        return result
+    return wrapper
+
+@st.fragment
+@traced_fragment
+def region_drill_down(region):
+    st.subheader("Projects")
+    st.caption("Select a project to view sub-divisions or positions.")
+    
+    model = view_models.get(snapshot, "region", region)
+
+    render_dynamic_buttons(
+        model.projects, f"reg_proj_{region}", st.session_state.reg_selected_project, toggle_reg_project,
+        new_items={p for r, p in highlight.new_projects if r == region} if highlight else (),
+    )
+
+    # -- Drill Down --
+    if st.session_state.reg_selected_project:
+        current_project = st.session_state.reg_selected_project
+        is_simple = current_project in model.simple
         
-        # Strip strings one last time to be safe
-        for col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
+        if is_simple:
+            st.markdown("---")
+            st.subheader(f"Open Positions in {current_project}")
+            
+            positions = model.positions[(current_project, None)]
+            
+            st.write(f"**Supervising Staff:** {positions.supervising}")
+            if positions.manager_required:
+                st.markdown(f"**⚠️ Manager required for {current_project} project.**")
+            
+            for role in positions.roles:
+                st.markdown(role_line(role, (region, current_project, current_project, role)))
+        else:
+            st.markdown("---")
+            st.subheader(f"Sub-divisions for {current_project}")
+            st.caption("Select a sub-division.")
+            
+            subdivs = model.subdivisions.get(current_project, ())
+
+            render_dynamic_buttons(
+                subdivs, f"reg_sub_{region}_{current_project}", st.session_state.reg_selected_subdiv,
+                toggle_reg_subdiv,
+                new_items={
+                    sd for r, p, sd in highlight.new_subdivisions if r == region and p == current_project
+                } if highlight else (),
+            )
+
+            if st.session_state.reg_selected_subdiv:
+                current_subdiv = st.session_state.reg_selected_subdiv
+                
+                st.markdown("---")
+                st.subheader(f"Open Positions in {current_subdiv}")
+                
+                positions = model.positions.get((current_project, current_subdiv), NO_POSITIONS)
+                
+                st.write(f"**Supervising Staff:** {positions.supervising}")
+                if positions.manager_required:
+                    st.markdown(f"**⚠️ Manager required for {current_subdiv} sub-division.**")
+                
+                for role in positions.roles:
+                    st.markdown(role_line(role, (region, current_project, current_subdiv, role)))
+
+    st.markdown("---")
+    render_export_buttons(
+        ExportScope(region, st.session_state.reg_selected_project, st.session_state.reg_selected_subdiv),
+        "reg_export",
+    )
+
+@st.fragment
+@traced_fragment
+def staff_drill_down(staff, header_context_project, header_context_sub, caption_text):
+    # One fragment for all regions: selecting a sub-division in one region
+    # has to clear the highlight in the others.
+    model = view_models.get(snapshot, "staff", staff)
+    
+    for region_code, full_reg_name, simple_projects, complex_projects in model.sections:
+        # 1. Simple Projects Group
+        if simple_projects:
+            st.subheader(f"{header_context_project} {full_reg_name}")
+            st.caption(caption_text)
+            
+            current_active_simple = None
+            if st.session_state.staff_selected_subdiv_key:
+                parts = st.session_state.staff_selected_subdiv_key.split('|')
+                if len(parts) == 3 and parts[0] == region_code and parts[1] == parts[2]:
+                    current_active_simple = parts[1]
+
+            render_dynamic_buttons(
+                simple_projects, f"staff_simple_{region_code}", current_active_simple,
+                functools.partial(toggle_staff_simple, region_code),
+                new_items={
+                    p for p in simple_projects if (staff, region_code, p, p) in highlight.new_placements
+                } if highlight else (),
+            )
+
+            if current_active_simple and current_active_simple in simple_projects:
+                st.markdown(f"**Open Positions in {current_active_simple}:**")
+                roles = index.staff_roles(staff, region_code, current_active_simple, current_active_simple)
+                for role in roles:
+                    st.markdown(role_line(
+                        role, (region_code, current_active_simple, current_active_simple, role), staff,
+                    ))
+            
+            st.markdown("---")
 
-        return df
-    except Exception as e:
-        return None
+        # 2. Complex Projects Groups
+        for proj, subs in complex_projects:
+            st.subheader(f"{header_context_sub} {proj} ({full_reg_name})")
+            st.caption(caption_text)
+            
+            current_active_sub = None
+            if st.session_state.staff_selected_subdiv_key:
+                parts = st.session_state.staff_selected_subdiv_key.split('|')
+                if len(parts) == 3 and parts[0] == region_code and parts[1] == proj:
+                    current_active_sub = parts[2]
+
+            render_dynamic_buttons(
+                subs, f"staff_complex_{region_code}_{proj}", current_active_sub,
+                functools.partial(toggle_staff_subdiv, region_code, proj),
+                new_items={
+                    sd for sd in subs if (staff, region_code, proj, sd) in highlight.new_placements
+                } if highlight else (),
+            )
+            
+            if current_active_sub and current_active_sub in subs:
+                st.markdown(f"**Open Positions in {current_active_sub}:**")
+                roles = index.staff_roles(staff, region_code, proj, current_active_sub)
+                for role in roles:
+                    st.markdown(role_line(role, (region_code, proj, current_active_sub, role), staff))
+            
+            st.markdown("---")
+
+# --- Data Loading ---
+@st.cache_resource
+def get_store():
+    """One store per process: every session shares the same snapshot without copying it."""
+    return SnapshotStore(
+        open_source(DATA_SOURCE),
+        refresh_interval=REFRESH_INTERVAL,
+        cache_dir=SNAPSHOT_CACHE_DIR or None,
+        chunksize=INGEST_CHUNK_ROWS or None,
+        aliases=load_aliases(ALIASES_FILE) if ALIASES_FILE else None,
+    )
+
+# Derived artefacts live on the shared snapshot, so every session reuses them and
+# a refresh patches only the regions and staff its row diff touched.
+def get_search_index(snapshot):
+    """Built on the first search against a snapshot."""
+    return snapshot.derived("search_index", lambda s: SearchIndex.from_index(s.index))
+
+def get_cube(snapshot):
+    """Aggregates for the Summary view."""
+    return snapshot.derived(
+        "cube",
+        lambda s: RecruitmentCube.from_frame(s.frame()),
+        lambda cube, s: cube.with_regions(s.frame(), s.diff.affected_regions),
+    )
+
+@st.cache_resource
+def get_view_models():
+    """One LRU of view models per process, shared by every session."""
+    return ViewModelCache(VIEW_CACHE_SIZE)
+
+@st.cache_resource
+def get_exports():
+    """Encoded downloads, per (snapshot version, scope, format)."""
+    return ExportCache(EXPORT_CACHE_MB * 1024 * 1024)
 
 # --- Pre-Calculation & Data Loading ---
-df = load_data()
+store = get_store()
+view_models = get_view_models()
+exports = get_exports()
+
+cold_start = not store.loaded
+with trace.stage("load_data"):
+    if not cold_start:
+        trace.count("snapshot_hits")
+        snapshot = store.get()
+    else:
+        # First load in this process: show progress while the export streams in.
+        trace.count("snapshot_misses")
+        load_progress = st.progress(0.0, text="Loading recruitment data...")
+        snapshot = store.get(
+            progress=lambda done: load_progress.progress(done, text="Loading recruitment data...")
+        )
+        load_progress.empty()
+        if snapshot is not None:
+            trace.count("rows_scanned", snapshot.row_count)
 
 # Initialize empty lists to ensure variables exist even if data fails
 all_regions = []
 all_staff = []
 
-if df is not None and not df.empty:
+if snapshot is not None and not snapshot.empty:
     # They are now available for both the Sidebar and the Home View below.
-    all_regions = sort_region_list(df['Region'].unique())
-    all_staff = sort_staff_list(df['Staff_Lead'].unique())
+    index = snapshot.index
+    all_regions = index.regions
+    all_staff = index.staff
+    # A deep link, or a selection made before the last refresh, may name rows that are gone
+    validate_nav_state(index)
+
+# Rows added by the last refresh are badged when the sidebar toggle is on
+last_diff = snapshot.diff if snapshot is not None else None
+highlight = last_diff if last_diff is not None and st.session_state.get("highlight_new") else None
+
+# --- Warm-Up ---
+# ?warmup=1 is the headless visit made by tools.probe and the keep-alive workflow:
+# besides loading the snapshot it builds the views a first visitor would wait for,
+# then reports what it did as JSON instead of drawing the page.
+if st.query_params.get("warmup") == "1":
+    if snapshot is None or snapshot.empty:
+        st.json({"ready": False, "error": str(store.last_error or "no rows loaded")})
+        st.stop()
+    warm_start = time.perf_counter()
+    warmed = view_models.warm(snapshot)
+    get_search_index(snapshot)
+    get_cube(snapshot)
+    st.json({
+        "ready": True,
+        "cold_start": cold_start,
+        "version": snapshot.version,
+        "rows": snapshot.row_count,
+        "view_models": warmed,
+        "warm_ms": round((time.perf_counter() - warm_start) * 1000, 1),
+    })
+    st.stop()
 
 # --- Sidebar ---
-with st.sidebar:
+with st.sidebar, trace.stage("sidebar"):
     st.header("Main Menu")
     
-    if st.button("🏠 Home", use_container_width=True):
-        go_home()
-        st.rerun()
+    st.button("🏠 Home", use_container_width=True, on_click=go_home)
+
+    st.button("📊 Summary", use_container_width=True, on_click=go_to_summary)
+
+    st.button("🔄 Refresh Data", use_container_width=True, on_click=store.request_refresh)
 
-    if st.button("🔄 Refresh Data", use_container_width=True):
-        st.cache_data.clear()
-        st.rerun()
+    # -- Data Freshness --
+    if store.refreshing:
+        st.caption("🔄 Refreshing data in the background...")
+    elif store.checked_at is not None:
+        st.caption(f"Data as of {format_age(time.time() - store.checked_at)}.")
+    if store.last_error is not None and snapshot is not None:
+        st.caption("⚠️ Could not reach Google Sheets. Showing the last loaded data.")
+    if last_diff is not None and not last_diff.empty:
+        st.toggle(f"{NEW_BADGE} Highlight new since last refresh", key="highlight_new")
+        st.caption(f"Last refresh: {last_diff.added_count} rows added, {last_diff.removed_count} removed.")
 
     st.markdown("---")
 
-    df = load_data()
+    if snapshot is not None and not snapshot.empty:
+        st.header("Search")
+
+        query = st.text_input(
+            "Search roles, projects, sub-divisions and staff:", key="search_query",
+            placeholder="e.g. engineer, Riyadh, Alice",
+        )
+        if query.strip():
+            with trace.stage("search"):
+                hits = get_search_index(snapshot).search(query, limit=SEARCH_RESULT_LIMIT)
+            if not hits:
+                st.caption("No matches.")
+            for i, hit in enumerate(hits):
+                st.button(
+                    f"{SEARCH_ICONS[hit.kind]} {hit.label}", key=f"search_hit_{i}",
+                    use_container_width=True, on_click=open_search_hit, args=(hit,),
+                )
+                st.caption(hit.context)
+
+        st.markdown("---")
 
-    if df is not None and not df.empty:
         st.header("Quick Jump")
         
         st.selectbox(
@@ -318,7 +728,7 @@ with st.sidebar:
 
 # --- Main Window ---
 
-if df is None:
+if snapshot is None:
     st.title("XAD Recruitment Details")
     st.error("⚠️ Error loading data from Google Sheets.")
     st.markdown("""
@@ -331,13 +741,14 @@ if df is None:
     """)
     st.stop()
 
-if df.empty:
+if snapshot.empty:
     st.title("XAD Recruitment Details")
     st.warning("⚠️ The Google Sheet appears to be empty. Please check the data source.")
     st.stop()
 
 
 # --- 1. HOME VIEW ---
+trace.begin("view")
 if st.session_state.view_mode == 'Home':
     st.title("XAD Recruitment Details")
     
@@ -345,16 +756,17 @@ if st.session_state.view_mode == 'Home':
     st.subheader("Browse by Region")
     st.caption("See all current projects in a specific region.")
     
-    region_map = {get_region_name(r): r for r in all_regions}
-    display_names = [get_region_name(r) for r in all_regions]
+    home = view_models.get(snapshot, "home")
     
     def home_reg_click(display_name):
-        code = region_map[display_name]
+        code = home.region_by_label[display_name]
         go_to_region(code)
-        st.rerun()
     
     with st.columns(1)[0]:
-        render_dynamic_buttons(display_names, "home_reg", None, home_reg_click)
+        render_dynamic_buttons(
+            home.region_labels, "home_reg", None, home_reg_click,
+            new_items={get_region_name(r) for r in highlight.new_regions} if highlight else (),
+        )
             
     st.markdown("---")
 
@@ -362,21 +774,18 @@ if st.session_state.view_mode == 'Home':
     st.subheader("Browse by Recruitment Staff")
     st.caption("See all sub-divisions managed by a specific staff member.")
     
-    def home_staff_click(s_name):
-        go_to_staff(s_name)
-        st.rerun()
-
     with st.columns(1)[0]:
-        render_dynamic_buttons(all_staff, "home_staff", None, home_staff_click)
+        render_dynamic_buttons(
+            home.staff, "home_staff", None, go_to_staff,
+            new_items=highlight.new_staff if highlight else (),
+        )
 
 
 # --- 2. REGION VIEW ---
 elif st.session_state.view_mode == 'Region':
     region = st.session_state.selected_region
-    full_region_name = get_region_name(region)
-    st.title(f"Region: {full_region_name}")
-    
-    region_df = df[df['Region'] == region]
+    region_model = view_models.get(snapshot, "region", region)
+    st.title(f"Region: {region_model.name}")
 
     col_content, col_sidebar_list = st.columns([3, 1])
 
@@ -384,83 +793,15 @@ elif st.session_state.view_mode == 'Region':
     with col_sidebar_list:
         st.subheader("Staff in this Region")
         st.caption("Recruitment staff active in this region.")
-        staff_in_region = sort_staff_list(region_df['Staff_Lead'].unique())
+        staff_in_region = region_model.staff
+        trace.count("widgets", len(staff_in_region))
         
         for s in staff_in_region:
-            if st.button(s, key=f"reg_side_staff_{s}"):
-                go_to_staff(s)
-                st.rerun()
+            st.button(s, key=f"reg_side_staff_{s}", on_click=go_to_staff, args=(s,))
 
     # --- Left Side: Projects ---
     with col_content:
-        st.subheader("Projects")
-        st.caption("Select a project to view sub-divisions or positions.")
-        
-        projects = sort_general_list(region_df['Project'].unique())
-        
-        def proj_click(p_name):
-            if st.session_state.reg_selected_project == p_name:
-                st.session_state.reg_selected_project = None
-            else:
-                st.session_state.reg_selected_project = p_name
-            st.session_state.reg_selected_subdiv = None
-            st.rerun()
-
-        render_dynamic_buttons(projects, "reg_proj", st.session_state.reg_selected_project, proj_click)
-
-        # -- Drill Down --
-        if st.session_state.reg_selected_project:
-            current_project = st.session_state.reg_selected_project
-            proj_df = region_df[region_df['Project'] == current_project]
-            is_simple = is_global_simple_project(df, region, current_project)
-            
-            if is_simple:
-                st.markdown("---")
-                st.subheader(f"Open Positions in {current_project}")
-                
-                staff_list = proj_df['Staff_Lead'].unique()
-                staff_str, is_mgr_req = format_staff_for_display(staff_list)
-                
-                st.write(f"**Supervising Staff:** {staff_str}")
-                if is_mgr_req:
-                    st.markdown(f"**⚠️ Manager required for {current_project} project.**")
-                
-                roles = sorted(proj_df['Role'].unique())
-                for role in roles:
-                    st.markdown(f"- {role}")
-            else:
-                st.markdown("---")
-                st.subheader(f"Sub-divisions for {current_project}")
-                st.caption("Select a sub-division.")
-                
-                subdivs = sort_general_list(proj_df['Sub_Division'].unique())
-                
-                def sub_click(sd_name):
-                    if st.session_state.reg_selected_subdiv == sd_name:
-                        st.session_state.reg_selected_subdiv = None
-                    else:
-                        st.session_state.reg_selected_subdiv = sd_name
-                    st.rerun()
-
-                render_dynamic_buttons(subdivs, "reg_sub", st.session_state.reg_selected_subdiv, sub_click)
-
-                if st.session_state.reg_selected_subdiv:
-                    current_subdiv = st.session_state.reg_selected_subdiv
-                    details_df = proj_df[proj_df['Sub_Division'] == current_subdiv]
-                    
-                    st.markdown("---")
-                    st.subheader(f"Open Positions in {current_subdiv}")
-                    
-                    staff_list = details_df['Staff_Lead'].unique()
-                    staff_str, is_mgr_req = format_staff_for_display(staff_list)
-                    
-                    st.write(f"**Supervising Staff:** {staff_str}")
-                    if is_mgr_req:
-                        st.markdown(f"**⚠️ Manager required for {current_subdiv} sub-division.**")
-                    
-                    roles = sorted(details_df['Role'].unique())
-                    for role in roles:
-                        st.markdown(f"- {role}")
+        region_drill_down(region)
 
 
 # --- 3. STAFF VIEW ---
@@ -468,19 +809,8 @@ elif st.session_state.view_mode == 'Staff':
     staff = st.session_state.selected_staff
     
     # Custom Header for Manager Required
-    if staff == "Manager Required":
-        st.title("Vacant Management Positions")
-        # Change the default 'managed by' text in main area
-        header_context_project = "Projects in" 
-        header_context_sub = "Sub-divisions in"
-        caption_text = "Managers are required for the following sub-divisions."
-    else:
-        st.title(f"Recruitment Staff: {staff}")
-        header_context_project = "Managed projects in"
-        header_context_sub = "Managed sub-divisions in"
-        caption_text = "Click to view open positions."
-    
-    staff_df = df[df['Staff_Lead'] == staff]
+    headings = staff_headings(staff)
+    st.title(headings.title)
     
     col_content, col_sidebar_list = st.columns([3, 1])
 
@@ -488,91 +818,101 @@ elif st.session_state.view_mode == 'Staff':
     with col_sidebar_list:
         st.subheader("Associated Regions")
         st.caption("Regions where this staff member is active.")
-        associated_regions = sort_region_list(staff_df['Region'].unique())
+        staff_model = view_models.get(snapshot, "staff", staff)
+        trace.count("widgets", len(staff_model.sections))
         
-        for r in associated_regions:
-            full_r = get_region_name(r)
-            if st.button(full_r, key=f"staff_side_reg_{r}"):
-                go_to_region(r)
-                st.rerun()
+        for section in staff_model.sections:
+            r, full_r = section.region, section.name
+            st.button(full_r, key=f"staff_side_reg_{r}", on_click=go_to_region, args=(r,))
+
+        st.markdown("---")
+        render_export_buttons(ExportScope(staff=staff), "staff_export")
 
     # --- Left Side: Managed Items ---
     with col_content:
-        regions_active = sort_region_list(staff_df['Region'].unique())
-        
-        for region_code in regions_active:
-            full_reg_name = get_region_name(region_code)
-            region_data = staff_df[staff_df['Region'] == region_code]
-            
-            staff_projects = sort_general_list(region_data['Project'].unique())
-            
-            simple_projects = []
-            complex_projects = {} 
-            
-            for proj in staff_projects:
-                if is_global_simple_project(df, region_code, proj):
-                    simple_projects.append(proj)
-                else:
-                    subs = sort_general_list(region_data[region_data['Project'] == proj]['Sub_Division'].unique())
-                    complex_projects[proj] = subs
-            
-            # 1. Simple Projects Group
-            if simple_projects:
-                st.subheader(f"{header_context_project} {full_reg_name}")
-                st.caption(caption_text)
-                
-                def simple_click(p_name):
-                    key = f"{region_code}|{p_name}|{p_name}"
-                    if st.session_state.staff_selected_subdiv_key == key:
-                        st.session_state.staff_selected_subdiv_key = None
-                    else:
-                        st.session_state.staff_selected_subdiv_key = key
-                    st.rerun()
-                
-                current_active_simple = None
-                if st.session_state.staff_selected_subdiv_key:
-                    parts = st.session_state.staff_selected_subdiv_key.split('|')
-                    if len(parts) == 3 and parts[0] == region_code and parts[1] == parts[2]:
-                        current_active_simple = parts[1]
-
-                render_dynamic_buttons(simple_projects, f"staff_simple_{region_code}", current_active_simple, simple_click)
-
-                if current_active_simple and current_active_simple in simple_projects:
-                    st.markdown(f"**Open Positions in {current_active_simple}:**")
-                    roles_df = region_data[(region_data['Project'] == current_active_simple) & (region_data['Sub_Division'] == current_active_simple)]
-                    roles = sorted(roles_df['Role'].unique())
-                    for role in roles:
-                        st.markdown(f"- {role}")
-                
-                st.markdown("---")
-
-            # 2. Complex Projects Groups
-            for proj, subs in complex_projects.items():
-                st.subheader(f"{header_context_sub} {proj} ({full_reg_name})")
-                st.caption(caption_text)
-                
-                def complex_click(sd_name):
-                    key = f"{region_code}|{proj}|{sd_name}"
-                    if st.session_state.staff_selected_subdiv_key == key:
-                        st.session_state.staff_selected_subdiv_key = None
-                    else:
-                        st.session_state.staff_selected_subdiv_key = key
-                    st.rerun()
-                
-                current_active_sub = None
-                if st.session_state.staff_selected_subdiv_key:
-                    parts = st.session_state.staff_selected_subdiv_key.split('|')
-                    if len(parts) == 3 and parts[0] == region_code and parts[1] == proj:
-                        current_active_sub = parts[2]
-
-                render_dynamic_buttons(subs, f"staff_complex_{region_code}_{proj}", current_active_sub, complex_click)
-                
-                if current_active_sub and current_active_sub in subs:
-                    st.markdown(f"**Open Positions in {current_active_sub}:**")
-                    roles_df = region_data[(region_data['Project'] == proj) & (region_data['Sub_Division'] == current_active_sub)]
-                    roles = sorted(roles_df['Role'].unique())
-                    for role in roles:
-                        st.markdown(f"- {role}")
-                
-                st.markdown("---")
-
+        staff_drill_down(staff, headings.project_heading, headings.subdivision_heading, headings.caption)
+
+
+# --- 4. SUMMARY VIEW ---
+elif st.session_state.view_mode == 'Summary':
+    st.title("Recruitment Summary")
+
+    with trace.stage("cube"):
+        cube = get_cube(snapshot)
+
+    totals = cube.totals()
+    metric_cols = st.columns(5)
+    metric_cols[0].metric("Open Positions", totals["positions"])
+    metric_cols[1].metric("Regions", totals["regions"])
+    metric_cols[2].metric("Projects", totals["projects"])
+    metric_cols[3].metric("Sub-divisions", totals["sub_divisions"])
+    metric_cols[4].metric("Manager Required", totals["manager_required"])
+
+    # -- By Region --
+    st.subheader("Open Positions by Region")
+    by_region = cube.by_region().rename(columns=SUMMARY_COLUMNS)
+    by_region["Region"] = by_region["Region"].map(get_region_name)
+    st.bar_chart(by_region, x="Region", y="Open Positions", horizontal=True, sort=False)
+    st.dataframe(by_region, hide_index=True)
+
+    # -- By Staff --
+    st.subheader("Open Positions by Staff Lead")
+    by_staff = cube.by_staff().rename(columns=SUMMARY_COLUMNS)
+    st.bar_chart(by_staff, x="Staff Lead", y="Open Positions", horizontal=True, sort=False)
+    st.dataframe(by_staff, hide_index=True)
+
+    # -- By Project --
+    st.subheader("Open Positions by Project")
+    project_region = st.selectbox(
+        "Region:", options=[None] + list(all_regions), key="summary_region",
+        format_func=lambda r: "All Regions" if r is None else get_region_name(r),
+    )
+    by_project = cube.by_project(project_region).rename(columns=SUMMARY_COLUMNS)
+    by_project["Region"] = by_project["Region"].map(get_region_name)
+    st.dataframe(by_project, hide_index=True)
+
+    # -- Manager Required --
+    st.subheader("Sub-divisions Requiring a Manager")
+    flagged = cube.manager_required().rename(columns=SUMMARY_COLUMNS)
+    if flagged.empty:
+        st.caption("Every sub-division has a staff lead.")
+    else:
+        flagged["Region"] = flagged["Region"].map(get_region_name)
+        st.dataframe(flagged, hide_index=True)
+
+    # -- Data Quality --
+    quality = snapshot.quality
+    if quality is not None:
+        with st.expander("Data Quality"):
+            st.caption(
+                f"{quality['rows_in']} sheet rows read, {quality['duplicate_rows']} exact duplicates dropped, "
+                f"{sum(quality['merged_spellings'].values())} spellings merged into their canonical value."
+            )
+            variants = [
+                {"Column": col, "Canonical Value": value, "Merged Spellings": ", ".join(spellings)}
+                for col, values in quality["variants"].items()
+                for value, spellings in values.items()
+            ]
+            if variants:
+                st.dataframe(variants, hide_index=True)
+
+    # -- Export --
+    st.subheader("Export Open Positions")
+    render_export_buttons(ExportScope(region=project_region), "summary_export")
+
+# --- Performance Panel ---
+trace.end("view")
+trace.context["view"] = st.session_state.view_mode
+perf_record = trace.finish()
+
+if PERF_PANEL and perf_record is not None:
+    with st.sidebar.expander("⏱ Performance", expanded=True):
+        st.caption(f"Snapshot {snapshot.version} · {snapshot.row_count} rows")
+        st.json(perf_record)
+        if "perf_last_fragment" in st.session_state:
+            st.caption("Last fragment rerun")
+            st.json(st.session_state.perf_last_fragment)
+        st.caption("View model cache")
+        st.json(view_models.info())
+        st.caption("Export cache")
+        st.json(exports.info())
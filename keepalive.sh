@@ -11,7 +11,7 @@ default_read() {
 }
 
 initialize_yaml() {
-    cat > "$YAML_FILE" <<EOL
+    cat > "$YAML_FILE" <<'EOL'
 name: Keep Streamlit Apps Alive
 
 on:
@@ -25,6 +25,22 @@ jobs:
     runs-on: ubuntu-latest
 
     steps:
+      - uses: actions/checkout@v4
+
+      - uses: actions/setup-python@v5
+        with:
+          python-version: '3.11'
+
+      - name: Install probe dependencies
+        run: pip install -r requirements-dev.txt
+
+      # One JSON-lines file of probe results per app; the last passing run is the baseline
+      # a regression is measured against. The cache is saved again when the job passes.
+      - uses: actions/cache@v4
+        with:
+          path: probe-history
+          key: probe-history-${{ github.run_id }}
+          restore-keys: probe-history-
 EOL
 }
 
@@ -48,8 +64,12 @@ add_app() {
     echo "Adding a new application..."
     read -p "Enter the URL of the new Streamlit app: " NEW_URL
     APP_NAME=$(basename "$NEW_URL")
-    echo "      - name: Send request to $APP_NAME" >> "$YAML_FILE"
-    echo "        run: curl -s -o /dev/null -w \"%{http_code}\\n\" $NEW_URL" >> "$YAML_FILE"
+    echo "" >> "$YAML_FILE"
+    echo "      - name: Warm up and probe $APP_NAME" >> "$YAML_FILE"
+    echo '        if: ${{ !cancelled() }}' >> "$YAML_FILE"
+    echo "        run: >-" >> "$YAML_FILE"
+    echo "          python -m tools.probe $NEW_URL --max-first-render-ms 10000" >> "$YAML_FILE"
+    echo "          --baseline probe-history/$APP_NAME.jsonl --output probe-history/$APP_NAME.jsonl" >> "$YAML_FILE"
     echo "Application added successfully!"
     sleep 2
 }
@@ -0,0 +1,5 @@
+"""Data layer for the XAD Recruitment Details app.
+
+The Streamlit script in ``app.py`` only renders; everything that can be computed
+once per data snapshot lives in this package so it can be reused without the UI.
+"""
@@ -0,0 +1,184 @@
+"""
+Read-only JSON API over the recruitment data, served without Streamlit.
+
+    python -m recruitment.api --port 8502
+
+The data source and store settings default to the app's XAD_DATA_SOURCE,
+XAD_REFRESH_INTERVAL, XAD_CACHE_DIR, XAD_CHUNK_ROWS and XAD_ALIASES variables.
+
+    GET /api/status
+    GET /api/quality
+    GET /api/regions
+    GET /api/staff
+    GET /api/region-staff?region=UAE
+    GET /api/projects?region=UAE
+    GET /api/sub-divisions?region=UAE&project=Metro
+    GET /api/positions?region=UAE&project=Metro[&subdiv=Line+1]
+    GET /api/staff-placements?staff=Alice
+
+Names go in query parameters because sub-divisions may contain slashes.
+Responses are cached per (snapshot version, request) and carry the version
+as their ETag, so a repeated request costs a dictionary lookup, or a 304 when
+the client sends If-None-Match, until the data changes.
+"""
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from recruitment.query import DataUnavailable, RecruitmentQuery
+
+# path -> (RecruitmentQuery method, required parameters, optional parameters)
+ROUTES = {
+    "/api/quality": ("quality", (), ()),
+    "/api/regions": ("regions", (), ()),
+    "/api/staff": ("staff", (), ()),
+    "/api/region-staff": ("region_staff", ("region",), ()),
+    "/api/projects": ("projects", ("region",), ()),
+    "/api/sub-divisions": ("sub_divisions", ("region", "project"), ()),
+    "/api/positions": ("positions", ("region", "project"), ("subdiv",)),
+    "/api/staff-placements": ("staff_placements", ("staff",), ()),
+}
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded response bodies."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so bulk clients are not paying for a connection per request
+    protocol_version = "HTTP/1.1"
+    server_version = "XADRecruitmentAPI/1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/")
+        query = self.server.query
+
+        if path == "/api/status":
+            return self._send(200, json.dumps(query.status()).encode())
+        if path not in ROUTES:
+            return self._send_error(404, f"unknown endpoint {url.path}")
+
+        method, required, optional = ROUTES[path]
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        missing = [name for name in required if not params.get(name)]
+        if missing:
+            return self._send_error(400, f"missing parameter(s): {', '.join(missing)}")
+
+        try:
+            snapshot = query.snapshot()
+        except DataUnavailable as e:
+            return self._send_error(503, f"data unavailable: {e}")
+
+        etag = f'"{snapshot.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, None, etag)
+
+        args = tuple(params.get(name) for name in required + optional)
+        key = (snapshot.version, method, args)
+        body = self.server.cache.get(key)
+        if body is None:
+            body = json.dumps(getattr(query, method)(*args)).encode()
+            self.server.cache.put(key, body)
+        self._send(200, body, etag)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(query, host="127.0.0.1", port=8502, cache_size=1024, verbose=False):
+    """A ThreadingHTTPServer answering the API from `query`; call serve_forever() on it."""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    server.query = query
+    server.cache = ResponseCache(cache_size)
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the recruitment data as a read-only JSON API.")
+    parser.add_argument("--source", default=os.environ.get("XAD_DATA_SOURCE"),
+                        help="sheet URL, .csv/.xlsx path or comma-separated list (default: XAD_DATA_SOURCE, "
+                             "else the XAD Google Sheet)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--refresh-interval", type=int, default=int(os.environ.get("XAD_REFRESH_INTERVAL", "600")),
+                        help="seconds between background revalidations (0 disables them)")
+    parser.add_argument("--cache-dir", default=os.environ.get("XAD_CACHE_DIR", ""),
+                        help="snapshot cache directory, shared with the app if it points at the same place")
+    parser.add_argument("--chunk-rows", type=int, default=int(os.environ.get("XAD_CHUNK_ROWS", "50000")))
+    parser.add_argument("--aliases", default=os.environ.get("XAD_ALIASES", ""),
+                        help="JSON file of extra spellings to canonicalise (see recruitment.canonical)")
+    parser.add_argument("--cache-size", type=int, default=1024, help="responses kept in memory")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if not args.source:
+        from recruitment.sources import DEFAULT_SHEET_URL
+        args.source = DEFAULT_SHEET_URL
+
+    query = RecruitmentQuery.open(
+        args.source,
+        refresh_interval=args.refresh_interval,
+        cache_dir=args.cache_dir or None,
+        chunksize=args.chunk_rows or None,
+        aliases=args.aliases or None,
+    )
+    # Load before accepting connections, so the first request is not the slow one.
+    status = query.status()
+    print(f"Loaded {status['rows']} rows (version {status['version']})")
+
+    server = make_server(query, args.host, args.port, args.cache_size, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}/api/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Canonical spellings and duplicate collapse for the hand-maintained sheet.
+
+clean_data() only strips cells, so "UAE", "uae" and "United Arab Emirates"
+used to reach the index as three regions, each with its own buttons, index
+partitions and lookups. A Canonicalizer maps every value of the key columns
+to one spelling per folded form (case and runs of whitespace ignored), after
+applying the alias tables, and then drops rows that are exact duplicates.
+
+Only distinct values are looked at: a cleaned column is categorical, so
+rewriting its categories rewrites every row. One Canonicalizer is used per
+snapshot. It remembers the spelling it chose for each value, so the chunks
+of a streamed export all agree, and its report() says what it changed.
+
+A value matching an alias (DEFAULT_ALIASES, extended by an aliases file)
+takes its target's folded form. The spelling chosen for a folded form is
+    1. a PREFERRED spelling (the REGION_MAPPING codes, 'Manager Required', ...)
+    2. else the alias target as written
+    3. else the first spelling met while reading, with inner whitespace collapsed
+
+fingerprint() digests these rules and tables; it is part of every snapshot
+version, so changing an alias rebuilds the snapshot even when the sheet has
+not changed.
+"""
+import hashlib
+import json
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from recruitment.cleaning import BLANK_FILL, CATEGORY_COLUMNS, LINKED_COLUMNS
+from recruitment.helpers import REGION_MAPPING
+
+CANONICAL_COLUMNS = CATEGORY_COLUMNS
+
+# Linked columns share aliases and chosen spellings, so a simple project
+# stays equal to its only sub-division
+_NAMESPACE = {col: col for col in CANONICAL_COLUMNS}
+_NAMESPACE.update((second, first) for first, second in LINKED_COLUMNS)
+
+PREFERRED = {
+    "Region": tuple(REGION_MAPPING),
+    "Staff_Lead": ("Manager Required", BLANK_FILL["Staff_Lead"]),
+    "Project": (BLANK_FILL["Project"],),
+    "Sub_Division": (BLANK_FILL["Sub_Division"],),
+    "Role": (BLANK_FILL["Role"],),
+}
+
+# Full region names are aliases of their codes, e.g. "united arab emirates" -> "UAE"
+DEFAULT_ALIASES = {
+    "Region": {name: code for code, name in REGION_MAPPING.items()},
+}
+
+# Bump whenever fold(), the choice of spelling or the duplicate collapse changes
+RULES_VERSION = 1
+
+
+def fold(value):
+    """The form two spellings of the same value share: casefolded, whitespace collapsed."""
+    return " ".join(str(value).split()).casefold()
+
+
+def load_aliases(path):
+    """
+    Reads an aliases file: a JSON object of column -> {spelling: canonical}, e.g.
+        {"Region": {"U.A.E.": "UAE"}, "Staff_Lead": {"TBD": "Manager Required"}}
+    """
+    with open(path, encoding="utf-8") as f:
+        aliases = json.load(f)
+    unknown = set(aliases) - set(CANONICAL_COLUMNS)
+    if unknown:
+        raise ValueError(f"aliases for unknown column(s): {', '.join(sorted(unknown))}")
+    return aliases
+
+
+def fingerprint(aliases=None):
+    """Short digest of the rules, PREFERRED and the alias tables (DEFAULT_ALIASES plus aliases)."""
+    tables = {col: dict(mapping) for col, mapping in DEFAULT_ALIASES.items()}
+    for col, mapping in (aliases or {}).items():
+        tables.setdefault(col, {}).update(mapping)
+    rules = {"rules": RULES_VERSION, "preferred": PREFERRED, "aliases": tables}
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:8]
+
+
+class Canonicalizer:
+    """Canonicalises the cleaned frames of one snapshot and counts what it changed."""
+
+    def __init__(self, aliases=None):
+        namespaces = set(_NAMESPACE.values())
+        self._aliases = {ns: {} for ns in namespaces}
+        for table in (DEFAULT_ALIASES, aliases or {}):
+            for col, mapping in table.items():
+                self._aliases[_NAMESPACE[col]].update(
+                    (fold(spelling), target) for spelling, target in mapping.items()
+                )
+        # folded form -> chosen spelling, per column (or pair of linked columns)
+        self._chosen = {ns: {} for ns in namespaces}
+        for col, values in PREFERRED.items():
+            self._chosen[_NAMESPACE[col]].update((fold(value), value) for value in values)
+        # chosen spelling -> other spellings mapped onto it, per column
+        self._variants = {col: defaultdict(set) for col in CANONICAL_COLUMNS}
+        self.rows_in = 0
+        self.duplicate_rows = 0
+
+    def canonical(self, col, value):
+        """The canonical spelling of one value of column col."""
+        namespace = _NAMESPACE[col]
+        key = fold(value)
+        target = self._aliases[namespace].get(key)
+        if target is not None:
+            chosen = self._chosen[namespace].setdefault(fold(target), target)
+        else:
+            chosen = self._chosen[namespace].setdefault(key, " ".join(str(value).split()))
+        if chosen != value:
+            self._variants[col][chosen].add(value)
+        return chosen
+
+    def apply(self, df):
+        """Rewrites the CANONICAL_COLUMNS of a frame returned by clean_data(), in place; returns it."""
+        self.rows_in += len(df)
+        for col in CANONICAL_COLUMNS:
+            column = df[col].cat
+            mapped = [self.canonical(col, value) for value in column.categories]
+            if mapped == list(column.categories):
+                continue
+            remap, categories = pd.factorize(pd.Index(mapped, dtype=column.categories.dtype))
+            remap = np.append(remap, -1)  # code -1 stays missing
+            df[col] = pd.Categorical.from_codes(remap[column.codes], categories)
+        return df
+
+    def collapse_duplicates(self, df):
+        """Drops rows equal in every column to an earlier row."""
+        duplicated = df.duplicated()
+        count = int(duplicated.sum())
+        if not count:
+            return df
+        self.duplicate_rows += count
+        return df[~duplicated].reset_index(drop=True)
+
+    def report(self):
+        """Data-quality report of everything seen so far, as JSON-ready dicts."""
+        return {
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_in - self.duplicate_rows,
+            "duplicate_rows": self.duplicate_rows,
+            "merged_spellings": {
+                col: sum(len(spellings) for spellings in self._variants[col].values())
+                for col in CANONICAL_COLUMNS
+            },
+            # column -> canonical value -> the spellings merged into it
+            "variants": {
+                col: {chosen: sorted(spellings) for chosen, spellings in sorted(variants.items())}
+                for col, variants in self._variants.items() if variants
+            },
+        }
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# --- Normalisation Rules ---
+# Pairs of columns that fall back to each other's value when one is blank
+LINKED_COLUMNS = [("Project", "Sub_Division")]
+
+# Value for cells that are still blank after the linked-column fallback
+BLANK_FILL = {
+    "Region": "Unspecified Region",
+    "Staff_Lead": "Unspecified",
+    "Project": "Unspecified",
+    "Sub_Division": "Unspecified",
+    "Role": "Unspecified",
+}
+
+# Low-cardinality columns kept as pandas categoricals
+CATEGORY_COLUMNS = ["Region", "Staff_Lead", "Project", "Sub_Division", "Role"]
+
+
+def _factorize_stripped(series):
+    """
+    Factorizes a column, stripping each distinct value once rather than every row.
+    Returns (codes, categories); blank or missing cells get code -1.
+    """
+    codes, uniques = pd.factorize(series)
+    stripped = pd.Index([str(value).strip() for value in uniques], dtype=object)
+    remap, categories = pd.factorize(stripped.where(stripped != ""))
+    remap = np.append(remap, -1)  # code -1 marks a missing cell
+    return remap[codes], categories
+
+
+def _recode(codes, categories, target):
+    """Re-expresses codes over `categories` as codes over `target`."""
+    lookup = np.append(target.get_indexer(categories), -1)
+    return lookup[codes]
+
+
+def clean_data(df):
+    """
+    Normalises a raw sheet export and returns a new DataFrame; df is left as it is.
+
+    Every column is stripped once and blanks become missing. Blank Project /
+    Sub_Division cells take the other's value, remaining blanks get their
+    BLANK_FILL value, and CATEGORY_COLUMNS become categoricals. Other columns
+    keep real NaNs. All steps after stripping work on integer codes.
+    """
+    # Strip whitespace from headers (set_axis returns a new frame, so the caller's keeps its own)
+    df = df.set_axis([str(c).strip() for c in df.columns], axis=1)
+
+    factorized = {col: _factorize_stripped(df[col]) for col in df.columns}
+
+    for first, second in LINKED_COLUMNS:
+        (a, a_cats), (b, b_cats) = factorized[first], factorized[second]
+        categories = a_cats.append(b_cats).unique()
+        a = _recode(a, a_cats, categories)
+        b = _recode(b, b_cats, categories)
+        factorized[first] = (np.where(a == -1, b, a), categories)
+        factorized[second] = (np.where(b == -1, a, b), categories)
+
+    for col, fill in BLANK_FILL.items():
+        codes, categories = factorized[col]
+        if (codes == -1).any():
+            if fill not in categories:
+                # Same dtype as the categories, so every chunk of an export agrees
+                categories = categories.append(pd.Index([fill], dtype=categories.dtype))
+            codes = np.where(codes == -1, categories.get_loc(fill), codes)
+        factorized[col] = (codes, categories)
+
+    columns = {}
+    for col, (codes, categories) in factorized.items():
+        if col in CATEGORY_COLUMNS:
+            # One category dtype for every column and chunk: pandas infers str or object
+            # depending on what the column held, and union_categoricals rejects a mix.
+            categories = pd.Index(categories, dtype=object)
+            columns[col] = pd.Categorical.from_codes(codes, categories).remove_unused_categories()
+        else:
+            values = np.append(np.asarray(categories, dtype=object), np.nan)
+            columns[col] = values[codes]
+
+    return pd.DataFrame(columns, index=df.index)
+
+
+def concat_cleaned(frames):
+    """
+    Stacks frames returned by clean_data(), merging the categories of
+    CATEGORY_COLUMNS instead of letting pd.concat fall back to object columns.
+    """
+    if len(frames) == 1:
+        return frames[0]
+    stacked = pd.concat([frame.drop(columns=CATEGORY_COLUMNS) for frame in frames], ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        stacked[col] = union_categoricals([frame[col] for frame in frames], ignore_order=True)
+    return stacked[list(frames[0].columns) + [c for c in stacked.columns if c not in frames[0].columns]]
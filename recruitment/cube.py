@@ -0,0 +1,135 @@
+"""
+Aggregate counts for the summary dashboard.
+
+A RecruitmentCube is one grouped pass over Region x Staff_Lead x Project x
+Sub_Division, holding the number of positions (sheet rows) and distinct roles
+in each cell. Every summary table is a slice of that small frame, so the
+dashboard never goes back to the raw rows.
+"""
+import functools
+
+import pandas as pd
+
+from recruitment.helpers import sort_general_list, sort_region_list, sort_staff_list
+
+CUBE_DIMENSIONS = ["Region", "Staff_Lead", "Project", "Sub_Division"]
+
+MANAGER_REQUIRED = "Manager Required"
+
+
+def _memoized(method):
+    # Slices are computed once per cube; callers get a copy they may modify.
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__, *args)
+        if key not in self._slices:
+            self._slices[key] = method(self, *args)
+        result = self._slices[key]
+        return result.copy() if isinstance(result, (pd.DataFrame, dict)) else result
+    return wrapper
+
+
+class RecruitmentCube:
+    """
+    Read-only aggregate of one snapshot, shared by every session. Each slice
+    is computed on first use and returned as a new DataFrame in display order.
+    """
+
+    def __init__(self, cells):
+        self._cells = cells
+        self._slices = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        grouped = df.groupby(CUBE_DIMENSIONS, observed=True, sort=False)["Role"]
+        cells = grouped.agg(positions="size", roles="nunique").reset_index()
+        for col in CUBE_DIMENSIONS:
+            cells[col] = cells[col].astype(object)
+        return cls(cells)
+
+    def with_regions(self, df, regions):
+        """
+        Returns a new cube for `df` that regroups only the rows of the given
+        regions and keeps this cube's cells for all others.
+        """
+        regions = set(regions)
+        kept = self._cells[~self._cells["Region"].isin(regions)]
+        fresh = RecruitmentCube.from_frame(df[df["Region"].isin(regions)])._cells
+        return RecruitmentCube(pd.concat([kept, fresh], ignore_index=True))
+
+    @property
+    def cells(self):
+        return self._cells.copy()
+
+    def _flagged(self):
+        return self._cells[self._cells["Staff_Lead"] == MANAGER_REQUIRED]
+
+    @staticmethod
+    def _order(table, column, sort_func):
+        order = {value: i for i, value in enumerate(sort_func(table[column].unique()))}
+        return table.sort_values(column, kind="stable", key=lambda values: values.map(order)).reset_index(drop=True)
+
+    @_memoized
+    def totals(self):
+        cells = self._cells
+        return {
+            "positions": int(cells["positions"].sum()),
+            "regions": cells["Region"].nunique(),
+            "projects": len(cells[["Region", "Project"]].drop_duplicates()),
+            "sub_divisions": len(cells[["Region", "Project", "Sub_Division"]].drop_duplicates()),
+            "staff": cells.loc[cells["Staff_Lead"] != MANAGER_REQUIRED, "Staff_Lead"].nunique(),
+            "manager_required": len(self._flagged()[["Region", "Project", "Sub_Division"]].drop_duplicates()),
+        }
+
+    @_memoized
+    def by_region(self):
+        """Positions, projects, sub-divisions, staff and Manager Required sub-divisions per region."""
+        cells = self._cells
+        staffed = cells[cells["Staff_Lead"] != MANAGER_REQUIRED]
+        flagged = self._flagged()
+        table = pd.DataFrame({
+            "positions": cells.groupby("Region")["positions"].sum(),
+            "projects": cells.groupby("Region")["Project"].nunique(),
+            "sub_divisions": cells.drop_duplicates(["Region", "Project", "Sub_Division"]).groupby("Region").size(),
+            "staff": staffed.groupby("Region")["Staff_Lead"].nunique(),
+            "manager_required": flagged.drop_duplicates(["Region", "Project", "Sub_Division"])
+                                       .groupby("Region").size(),
+        }).fillna(0).astype(int).rename_axis("Region").reset_index()
+        return self._order(table, "Region", sort_region_list)
+
+    @_memoized
+    def by_staff(self):
+        """Positions, regions, projects and sub-divisions per staff lead."""
+        grouped = self._cells.groupby("Staff_Lead")
+        table = pd.DataFrame({
+            "positions": grouped["positions"].sum(),
+            "regions": grouped["Region"].nunique(),
+            "projects": self._cells.drop_duplicates(["Staff_Lead", "Region", "Project"])
+                                   .groupby("Staff_Lead").size(),
+            "sub_divisions": grouped.size(),
+        }).rename_axis("Staff_Lead").reset_index()
+        return self._order(table, "Staff_Lead", sort_staff_list)
+
+    @_memoized
+    def by_project(self, region=None):
+        """Positions, sub-divisions and staff per project, for one region or all of them."""
+        cells = self._cells
+        if region is not None:
+            cells = cells[cells["Region"] == region]
+        grouped = cells.groupby(["Region", "Project"])
+        table = pd.DataFrame({
+            "positions": grouped["positions"].sum(),
+            "sub_divisions": grouped["Sub_Division"].nunique(),
+            "staff": cells[cells["Staff_Lead"] != MANAGER_REQUIRED].groupby(["Region", "Project"])["Staff_Lead"]
+                                                                   .nunique(),
+        }).fillna(0).astype(int).reset_index()
+        table = self._order(table, "Project", sort_general_list)
+        return self._order(table, "Region", sort_region_list) if region is None else table
+
+    @_memoized
+    def manager_required(self):
+        """Sub-divisions with no staff lead assigned, with their position counts."""
+        table = self._flagged()[["Region", "Project", "Sub_Division", "positions"]]
+        table = self._order(table, "Sub_Division", sort_general_list)
+        table = self._order(table, "Project", sort_general_list)
+        return self._order(table, "Region", sort_region_list)
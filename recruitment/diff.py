@@ -0,0 +1,97 @@
+"""
+Row-level differences between two snapshots.
+
+Rows are compared by a hash of all their cleaned values. The sheet has no row
+identifier, so an edited row shows up as one removed and one added row. The
+regions and staff of those rows are the only index partitions a refresh has
+to rebuild; everything else carries over from the previous snapshot.
+"""
+import pandas as pd
+
+
+def row_hashes(df):
+    """One uint64 per row, equal for rows with equal values in every column."""
+    return pd.util.hash_pandas_object(df[sorted(df.columns)], index=False).to_numpy()
+
+
+def _keys(df):
+    """Every region, staff, project, sub-division, role and placement key of df's rows."""
+    rows = list(df[["Region", "Project", "Sub_Division", "Staff_Lead", "Role"]]
+                .drop_duplicates().itertuples(index=False, name=None))
+    return {
+        "regions": {region for region, *_ in rows},
+        "staff": {staff for *_, staff, _ in rows},
+        "projects": {(region, project) for region, project, *_ in rows},
+        "subdivisions": {(region, project, subdiv) for region, project, subdiv, *_ in rows},
+        "roles": {(region, project, subdiv, role) for region, project, subdiv, _, role in rows},
+        "placements": {(staff, region, project, subdiv) for region, project, subdiv, staff, _ in rows},
+        "staff_roles": {(staff, region, project, subdiv, role) for region, project, subdiv, staff, role in rows},
+    }
+
+
+class SnapshotDiff:
+    """
+    What changed from the snapshot with previous_version to the next one.
+
+    added and removed hold one row per distinct changed record (duplicates
+    count once there, but in the counts). The affected_* sets cover both sides
+    and drive partial rebuilds. The new_* sets hold the keys of added rows
+    that the previous frame, when given, did not have at all; they drive the
+    "new since the last refresh" highlighting.
+    """
+
+    def __init__(self, previous_version, added, removed, added_count, removed_count, previous=None):
+        self.previous_version = previous_version
+        self.added = added
+        self.removed = removed
+        self.added_count = added_count
+        self.removed_count = removed_count
+
+        changed = pd.concat([added, removed], ignore_index=True)
+        self.affected_regions = frozenset(changed["Region"])
+        self.affected_staff = frozenset(changed["Staff_Lead"])
+
+        keys = _keys(added)
+        if previous is not None:
+            # Apart from staff, every key starts with a region, so only the
+            # previous rows of the added rows' regions can already hold it.
+            known = _keys(previous[previous["Region"].isin(keys["regions"])])
+            known["staff"] = set(previous["Staff_Lead"].unique())
+            keys = {name: values - known[name] for name, values in keys.items()}
+        self.new_regions = frozenset(keys["regions"])
+        self.new_staff = frozenset(keys["staff"])
+        self.new_projects = frozenset(keys["projects"])
+        self.new_subdivisions = frozenset(keys["subdivisions"])
+        self.new_roles = frozenset(keys["roles"])
+        self.new_placements = frozenset(keys["placements"])
+        self.new_staff_roles = frozenset(keys["staff_roles"])
+
+    @property
+    def empty(self):
+        return not self.added_count and not self.removed_count
+
+    def __repr__(self):
+        return (f"SnapshotDiff(+{self.added_count} -{self.removed_count}, "
+                f"{len(self.affected_regions)} regions, {len(self.affected_staff)} staff)")
+
+
+def diff_frames(old, new, previous_version=None):
+    """Diffs two cleaned frames by row hash, counting duplicate rows."""
+    old_hashes = pd.Series(row_hashes(old))
+    new_hashes = pd.Series(row_hashes(new))
+    delta = new_hashes.value_counts().sub(old_hashes.value_counts(), fill_value=0)
+    added = delta[delta > 0]
+    removed = delta[delta < 0]
+
+    def pick(df, hashes, keys):
+        mask = hashes.isin(keys.index) & ~hashes.duplicated()
+        return df[mask.to_numpy()].reset_index(drop=True)
+
+    return SnapshotDiff(
+        previous_version,
+        pick(new, new_hashes, added),
+        pick(old, old_hashes, removed),
+        int(added.sum()),
+        int(-removed.sum()),
+        old,
+    )
@@ -0,0 +1,164 @@
+"""
+CSV and XLSX exports of the open positions in a scope.
+
+A scope is a region (optionally narrowed to a project and sub-division), a
+staff member, or the whole sheet. Exports contain the scope's sheet rows in
+sheet order, one row per position, with the region's full name next to its
+code. Files are written in chunks of EXPORT_CHUNK_ROWS rows (XLSX through
+openpyxl's write-only mode), so a full-sheet export never holds a second
+full-size copy of the frame.
+
+ExportCache keeps the encoded files per (snapshot version, scope, format):
+a popular scope is encoded once, and a session asking for a scope that is
+already being built waits for that build instead of starting another.
+"""
+import io
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from recruitment.helpers import get_region_name
+
+EXPORT_FORMATS = ("csv", "xlsx")
+
+EXPORT_MIME = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+EXPORT_CHUNK_ROWS = 20_000
+
+SHEET_TITLE = "Open Positions"
+
+# Fields left as None are not filtered on; ExportScope() is the whole sheet
+ExportScope = namedtuple("ExportScope", "region project subdiv staff", defaults=(None, None, None, None))
+
+
+def scope_label(scope):
+    """Human-readable name of a scope, e.g. 'UAE / Metro / Line 1' or 'All positions'."""
+    if scope.staff is not None:
+        return scope.staff
+    parts = [get_region_name(scope.region) if scope.region is not None else None, scope.project, scope.subdiv]
+    parts = [part for part in parts if part is not None]
+    return " / ".join(parts) if parts else "All positions"
+
+
+def export_file_name(scope, fmt):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", scope_label(scope)).strip("-").lower() or "positions"
+    return f"xad-{slug}.{fmt}"
+
+
+def scope_rows(df, scope):
+    """The rows of df inside scope, in sheet order, with a 'Region Name' column after 'Region'."""
+    mask = pd.Series(True, index=df.index)
+    for col, value in (("Region", scope.region), ("Project", scope.project),
+                       ("Sub_Division", scope.subdiv), ("Staff_Lead", scope.staff)):
+        if value is not None:
+            mask &= df[col] == value
+    rows = df[mask] if not mask.all() else df
+    rows = rows.copy(deep=False)
+    # One lookup per category rather than per row
+    rows.insert(rows.columns.get_loc("Region") + 1, "Region Name", rows["Region"].map(get_region_name))
+    return rows
+
+
+def _chunks(rows, chunksize):
+    for start in range(0, len(rows), chunksize):
+        yield rows.iloc[start:start + chunksize]
+
+
+def write_csv(rows, out, chunksize=EXPORT_CHUNK_ROWS):
+    """Writes rows as UTF-8 CSV (with a BOM, so Excel picks the encoding up) to a binary stream."""
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="", write_through=True)
+    if rows.empty:
+        rows.to_csv(text, index=False)
+    for i, chunk in enumerate(_chunks(rows, chunksize)):
+        chunk.to_csv(text, index=False, header=i == 0)
+    text.detach()
+
+
+def write_xlsx(rows, out, chunksize=EXPORT_CHUNK_ROWS):
+    """Writes rows as a one-sheet workbook to a binary stream, row by row."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_TITLE)
+    sheet.append(list(rows.columns))
+    for chunk in _chunks(rows, chunksize):
+        # openpyxl cannot store NaN; blank cells are written as empty
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(out)
+
+
+WRITERS = {
+    "csv": write_csv,
+    "xlsx": write_xlsx,
+}
+
+
+def export_bytes(df, scope, fmt):
+    out = io.BytesIO()
+    WRITERS[fmt](scope_rows(df, scope), out)
+    return out.getvalue()
+
+
+class ExportCache:
+    """
+    Thread-safe LRU of encoded exports, bounded by their total size in bytes.
+
+    Keyed by (snapshot version, scope, format). Encoding happens outside the
+    lock, so a large export only holds up sessions asking for the same file.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def get(self, snapshot, scope, fmt):
+        key = (snapshot.version, scope, fmt)
+        while True:
+            with self._lock:
+                data = self._entries.get(key)
+                if data is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return data
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            building.wait()
+
+        try:
+            data = export_bytes(snapshot.frame(), scope, fmt)
+            self.misses += 1
+            with self._lock:
+                if len(data) <= self.max_bytes:
+                    self._entries[key] = data
+                    self.size += len(data)
+                    while self.size > self.max_bytes:
+                        _, evicted = self._entries.popitem(last=False)
+                        self.size -= len(evicted)
+            return data
+        finally:
+            with self._lock:
+                del self._building[key]
+            building.set()
+
+    def info(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
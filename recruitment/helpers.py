@@ -0,0 +1,121 @@
+import functools
+
+# --- Mappings ---
+REGION_MAPPING = {
+    "UAE": "United Arab Emirates",
+    "KSA": "Kingdom of Saudi Arabia",
+    "UK": "United Kingdom",
+    "Unspecified Region": "Unspecified Region"
+}
+
+def get_region_name(acronym):
+    return REGION_MAPPING.get(acronym, acronym)
+
+# --- Sorting & Formatting ---
+# These take distinct, canonical values (the index hands them sets built from
+# the canonicalised frame), so they only sort and never deduplicate.
+
+def sort_staff_list(staff_list):
+    """
+    Pins 'Manager Required' to top.
+    Pins 'Unspecified' to bottom.
+    Sorts rest alphabetically.
+    """
+    unique_staff = sorted(staff_list)
+    
+    special_top = []
+    if "Manager Required" in unique_staff:
+        unique_staff.remove("Manager Required")
+        special_top.append("Manager Required")
+        
+    special_bottom = []
+    if "Unspecified" in unique_staff:
+        unique_staff.remove("Unspecified")
+        special_bottom.append("Unspecified")
+        
+    return special_top + unique_staff + special_bottom
+
+def sort_region_list(region_list):
+    """Pins 'Unspecified Region' to bottom."""
+    unique = sorted(region_list)
+    if "Unspecified Region" in unique:
+        unique.remove("Unspecified Region")
+        unique.append("Unspecified Region")
+    return unique
+
+def sort_general_list(item_list):
+    """Pins 'Unspecified' to bottom for Projects/Sub-divs."""
+    unique = sorted(item_list)
+    if "Unspecified" in unique:
+        unique.remove("Unspecified")
+        unique.append("Unspecified")
+    return unique
+
+def format_staff_for_display(staff_list):
+    """
+    Formats staff list for the 'Supervising Staff' line.
+    Removes 'Manager Required'.
+    Returns (formatted_string, boolean_is_manager_required)
+    """
+    clean_list = sorted(staff_list)
+    is_mgr_req = False
+    
+    if "Manager Required" in clean_list:
+        clean_list.remove("Manager Required")
+        is_mgr_req = True
+        
+    if not clean_list:
+        return "None", is_mgr_req
+        
+    if len(clean_list) == 1:
+        return clean_list[0], is_mgr_req
+        
+    return ", ".join(clean_list[:-1]) + " and " + clean_list[-1], is_mgr_req
+
+def format_age(seconds):
+    """Human-readable age for the 'data as of' caption, e.g. '5 min ago'."""
+    if seconds < 60:
+        return "just now"
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes} min ago"
+    hours = minutes // 60
+    if hours < 48:
+        return f"{hours} h ago"
+    return f"{hours // 24} days ago"
+
+# --- Button Layout ---
+
+@functools.lru_cache(maxsize=256)
+def pack_button_rows(items, max_chars):
+    """
+    Packs button labels into rows of roughly max_chars characters each.
+    items must be a tuple; layouts are cached per (items, max_chars).
+    """
+    rows = []
+    current_row = []
+    current_len = 0
+
+    for item in items:
+        # Estimate length: chars + padding buffer
+        item_len = len(str(item)) + 6
+
+        if current_len + item_len > max_chars and current_row:
+            rows.append(tuple(current_row))
+            current_row = []
+            current_len = 0
+
+        current_row.append(item)
+        current_len += item_len
+
+    if current_row:
+        rows.append(tuple(current_row))
+    return tuple(rows)
+
+@functools.lru_cache(maxsize=256)
+def filter_items(items, query):
+    """Items containing query, case-insensitively. items must be a tuple."""
+    needle = query.strip().casefold()
+    if not needle:
+        return items
+    return tuple(item for item in items if needle in str(item).casefold())
@@ -0,0 +1,186 @@
+"""
+RecruitmentIndex, the lookup tables the views read instead of filtering the
+DataFrame, and IndexBuilder, which fills them from whole frames or chunk by
+chunk.
+"""
+from collections import defaultdict
+
+from recruitment.helpers import sort_general_list, sort_region_list, sort_staff_list
+
+INDEX_COLUMNS = ["Region", "Project", "Sub_Division", "Staff_Lead", "Role"]
+
+
+class RecruitmentIndex:
+    """
+    Read-only lookup tables for the Region -> Project -> Sub_Division hierarchy.
+
+    Built once per data snapshot so the views never have to filter the
+    DataFrame. Every accessor returns a tuple in display order; unknown keys
+    return an empty tuple.
+    """
+
+    def __init__(self, tables):
+        self._tables = tables
+
+    def _get(self, table, key):
+        return self._tables[table].get(key, ())
+
+    # --- Home ---
+    @property
+    def regions(self):
+        return self._tables["regions"]
+
+    @property
+    def staff(self):
+        return self._tables["staff"]
+
+    # --- Region View ---
+    def region_staff(self, region):
+        return self._get("region_staff", region)
+
+    def region_projects(self, region):
+        return self._get("region_projects", region)
+
+    def subdivisions(self, region, project):
+        return self._get("subdivisions", (region, project))
+
+    def is_simple(self, region, project):
+        """A project is 'simple' when its only sub-division is itself."""
+        return (region, project) in self._tables["simple"]
+
+    def supervising_staff(self, region, project, subdiv=None):
+        return self._get("supervising_staff", (region, project, subdiv))
+
+    def roles(self, region, project, subdiv=None):
+        return self._get("roles", (region, project, subdiv))
+
+    # --- Staff View ---
+    def staff_regions(self, staff):
+        return self._get("staff_regions", staff)
+
+    def staff_projects(self, staff, region):
+        return self._get("staff_projects", (staff, region))
+
+    def staff_subdivisions(self, staff, region, project):
+        return self._get("staff_subdivisions", (staff, region, project))
+
+    def staff_roles(self, staff, region, project, subdiv):
+        return self._get("staff_roles", (staff, region, project, subdiv))
+
+    def staff_placements(self, staff):
+        """All (region, project, sub_division) triples a staff member covers."""
+        return self._get("staff_placements", staff)
+
+    # --- Partial Rebuilds ---
+    def with_partitions(self, df, regions, staff):
+        """
+        Returns a new index for `df` that rebuilds only the entries of the given
+        regions and staff, reusing this index for everything else. Correct when
+        every row that differs between this index's frame and df belongs to one
+        of those regions and one of those staff (see recruitment.diff).
+        """
+        regions, staff = set(regions), set(staff)
+        affected = df[df["Region"].isin(regions) | df["Staff_Lead"].isin(staff)]
+        fresh = IndexBuilder().add(affected).build()._tables
+
+        tables = {}
+        for names, owned in ((_REGION_TABLES, regions), (_STAFF_TABLES, staff)):
+            for table in names:
+                merged = {key: value for key, value in self._tables[table].items() if _partition(key) not in owned}
+                merged.update((key, value) for key, value in fresh[table].items() if _partition(key) in owned)
+                tables[table] = merged
+
+        tables["simple"] = frozenset(
+            key for key in self._tables["simple"] if key[0] not in regions
+        ) | frozenset(key for key in fresh["simple"] if key[0] in regions)
+        tables["regions"] = tuple(sort_region_list(tables["region_projects"]))
+        tables["staff"] = tuple(sort_staff_list(tables["staff_regions"]))
+        return RecruitmentIndex(tables)
+
+
+# Tables keyed by region (or a tuple starting with one) and by staff member
+_REGION_TABLES = ("region_staff", "region_projects", "subdivisions", "supervising_staff", "roles")
+_STAFF_TABLES = ("staff_regions", "staff_projects", "staff_subdivisions", "staff_roles", "staff_placements")
+
+
+def _partition(key):
+    # The region or staff member a table key belongs to
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _freeze(groups, sort_func=sorted):
+    # Empties `groups` as it goes so the sets and tuples never coexist in full.
+    frozen = {}
+    while groups:
+        key, values = groups.popitem()
+        frozen[key] = tuple(sort_func(values))
+    return frozen
+
+
+class IndexBuilder:
+    """
+    Accumulates distinct assignments from one or more cleaned frames (e.g.
+    chunks of a streamed export) and freezes them into a RecruitmentIndex.
+    build() consumes the accumulated sets, so a builder is used only once.
+    """
+
+    def __init__(self):
+        self.region_staff = defaultdict(set)
+        self.region_projects = defaultdict(set)
+        self.subdivisions = defaultdict(set)
+        self.supervising_staff = defaultdict(set)
+        self.roles = defaultdict(set)
+        self.staff_regions = defaultdict(set)
+        self.staff_projects = defaultdict(set)
+        self.staff_subdivisions = defaultdict(set)
+        self.staff_roles = defaultdict(set)
+        self.staff_placements = defaultdict(set)
+
+    def add(self, df):
+        """
+        Only distinct (Region, Project, Sub_Division, Staff_Lead, Role) rows are
+        visited, so the cost scales with the number of distinct assignments
+        rather than the number of rows in the sheet.
+        """
+        distinct = df[INDEX_COLUMNS].drop_duplicates()
+        for region, project, subdiv, staff, role in distinct.itertuples(index=False, name=None):
+            self.region_staff[region].add(staff)
+            self.region_projects[region].add(project)
+            self.subdivisions[(region, project)].add(subdiv)
+            self.supervising_staff[(region, project, None)].add(staff)
+            self.supervising_staff[(region, project, subdiv)].add(staff)
+            self.roles[(region, project, None)].add(role)
+            self.roles[(region, project, subdiv)].add(role)
+            self.staff_regions[staff].add(region)
+            self.staff_projects[(staff, region)].add(project)
+            self.staff_subdivisions[(staff, region, project)].add(subdiv)
+            self.staff_roles[(staff, region, project, subdiv)].add(role)
+            self.staff_placements[staff].add((region, project, subdiv))
+        return self
+
+    def build(self):
+        simple = frozenset(
+            key for key, subs in self.subdivisions.items()
+            if len(subs) == 1 and key[1] in subs
+        )
+
+        return RecruitmentIndex({
+            "regions": tuple(sort_region_list(self.region_projects)),
+            "staff": tuple(sort_staff_list(self.staff_regions)),
+            "region_staff": _freeze(self.region_staff, sort_staff_list),
+            "region_projects": _freeze(self.region_projects, sort_general_list),
+            "subdivisions": _freeze(self.subdivisions, sort_general_list),
+            "simple": simple,
+            "supervising_staff": _freeze(self.supervising_staff),
+            "roles": _freeze(self.roles),
+            "staff_regions": _freeze(self.staff_regions, sort_region_list),
+            "staff_projects": _freeze(self.staff_projects, sort_general_list),
+            "staff_subdivisions": _freeze(self.staff_subdivisions, sort_general_list),
+            "staff_roles": _freeze(self.staff_roles),
+            "staff_placements": _freeze(self.staff_placements),
+        })
+
+
+def build_index(df):
+    """Builds a RecruitmentIndex from a cleaned DataFrame."""
+    return IndexBuilder().add(df).build()
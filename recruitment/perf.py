@@ -0,0 +1,91 @@
+"""
+Lightweight per-rerun instrumentation.
+
+A RerunTrace collects stage durations and counters for one script run. When
+disabled, stage() hands back a shared no-op context manager and count()
+returns immediately, so the calls can stay in the hot path permanently.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+_NULL_STAGE = nullcontext()
+
+
+class RerunTrace:
+    def __init__(self, enabled=False, sink=None, **context):
+        self.enabled = enabled
+        self.sink = sink
+        self.context = context
+        self.stages = {}
+        self.counters = {}
+        self._open = {}
+        self._started = time.perf_counter() if enabled else None
+        self.finished = False
+
+    def stage(self, name):
+        """Context manager timing one stage. Repeated stages accumulate."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, time.perf_counter() - start)
+
+    def begin(self, name):
+        """Starts a stage that cannot be wrapped in a with block; see end()."""
+        if self.enabled:
+            self._open[name] = time.perf_counter()
+
+    def end(self, name):
+        if self.enabled and name in self._open:
+            self._add(name, time.perf_counter() - self._open.pop(name))
+
+    def _add(self, name, elapsed):
+        seconds, calls = self.stages.get(name, (0.0, 0))
+        self.stages[name] = (seconds + elapsed, calls + 1)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self):
+        return {
+            **self.context,
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "stages": {
+                name: {"ms": round(seconds * 1000, 3), "calls": calls}
+                for name, (seconds, calls) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def finish(self):
+        """Returns the summary and writes it to the sink, if any. None when disabled."""
+        self.finished = True
+        if not self.enabled:
+            return None
+        record = self.summary()
+        if self.sink is not None:
+            self.sink.write(record)
+        return record
+
+
+class JsonLinesSink:
+    """Appends one JSON object per rerun to a file; safe to share across sessions."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps({"ts": time.time(), **record}, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
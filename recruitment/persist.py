@@ -0,0 +1,123 @@
+"""
+On-disk copy of the last good Snapshot, so a cold start can render without
+waiting for the network and the app keeps working when Google is unreachable.
+
+Layout of the cache directory:
+    <version>.parquet       the cleaned DataFrame
+    <version>.index.pickle  the RecruitmentIndex built from it
+    meta.json               which version is current, plus fetch metadata,
+                            the source's validators, the fingerprint of the
+                            canonical rules and the data-quality report
+
+meta.json is replaced last and atomically, so a crash mid-write leaves the
+previous snapshot in place.
+"""
+import json
+import logging
+import os
+import pickle
+
+import pandas as pd
+
+from recruitment.index import build_index
+from recruitment.snapshot import Snapshot
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+# Bump whenever the cleaned frame or the index layout changes
+FORMAT_VERSION = 3
+
+
+def _data_paths(directory, version):
+    return (
+        os.path.join(directory, f"{version}.parquet"),
+        os.path.join(directory, f"{version}.index.pickle"),
+    )
+
+
+def _atomic_write(path, write):
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_snapshot(directory, snapshot, source=None, checked_at=None, validators=None, rules=None):
+    """
+    Writes the snapshot (if not already on disk) and its metadata.
+    Returns False instead of raising when the cache cannot be written.
+    """
+    try:
+        os.makedirs(directory, exist_ok=True)
+        frame_path, index_path = _data_paths(directory, snapshot.version)
+
+        if not os.path.exists(frame_path):
+            _atomic_write(frame_path, lambda p: snapshot.frame().to_parquet(p, index=False))
+        if not os.path.exists(index_path):
+            def write_index(p):
+                with open(p, "wb") as f:
+                    pickle.dump(snapshot.index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            _atomic_write(index_path, write_index)
+
+        meta = {
+            "format": FORMAT_VERSION,
+            "source": source,
+            "version": snapshot.version,
+            "fetched_at": snapshot.fetched_at,
+            "checked_at": checked_at,
+            "row_count": snapshot.row_count,
+            "validators": validators,
+            "rules": rules,
+            "quality": snapshot.quality,
+        }
+        def write_meta(p):
+            with open(p, "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+        _atomic_write(os.path.join(directory, META_FILE), write_meta)
+
+        _remove_stale_files(directory, snapshot.version)
+        return True
+    except Exception:
+        logger.warning("Could not write snapshot cache to %s", directory, exc_info=True)
+        return False
+
+
+def _remove_stale_files(directory, keep_version):
+    keep = set(os.path.basename(p) for p in _data_paths(directory, keep_version))
+    for name in os.listdir(directory):
+        if name.endswith((".parquet", ".index.pickle")) and name not in keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def load_snapshot(directory, source=None, rules=None):
+    """
+    Returns (Snapshot, meta) for the cached snapshot, or None if there is no
+    usable cache for this source and these canonical rules (see
+    recruitment.canonical.fingerprint). The index is rebuilt from the frame
+    if its file is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("format") != FORMAT_VERSION or meta.get("source") != source
+                or meta.get("rules") != rules):
+            return None
+
+        frame_path, index_path = _data_paths(directory, meta["version"])
+        df = pd.read_parquet(frame_path, memory_map=True)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Ignoring unreadable snapshot cache in %s", directory, exc_info=True)
+        return None
+
+    try:
+        with open(index_path, "rb") as f:
+            index = pickle.load(f)
+    except Exception:
+        index = build_index(df)
+
+    return Snapshot(df, index, meta["version"], meta["fetched_at"], quality=meta.get("quality")), meta
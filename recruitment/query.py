@@ -0,0 +1,117 @@
+"""
+UI-free queries over the recruitment data.
+
+RecruitmentQuery answers the questions the Streamlit views ask (regions,
+staff, projects, sub-divisions, open positions) as plain lists and dicts
+that serialise straight to JSON, for scripts, internal tools and
+recruitment.api. Importing this module does not import pandas or Streamlit;
+the data stack is loaded only when a store is opened.
+
+    query = RecruitmentQuery.open("sheet.csv")
+    query.positions("UAE", "Metro", "Line 1")
+"""
+from recruitment.helpers import format_staff_for_display, get_region_name
+
+
+class DataUnavailable(Exception):
+    """No snapshot could be loaded from the source (and none is cached)."""
+
+
+class RecruitmentQuery:
+    def __init__(self, store):
+        self.store = store
+
+    @classmethod
+    def open(cls, source, refresh_interval=0, cache_dir=None, chunksize=None, aliases=None):
+        """
+        Opens a SnapshotStore for a source spec (URL, file path or comma-separated
+        list); aliases is an alias table or the path of an aliases file.
+        """
+        from recruitment.canonical import load_aliases
+        from recruitment.sources import open_source
+        from recruitment.store import SnapshotStore
+
+        return cls(SnapshotStore(
+            open_source(source),
+            refresh_interval=refresh_interval,
+            cache_dir=cache_dir,
+            chunksize=chunksize,
+            aliases=load_aliases(aliases) if isinstance(aliases, str) else aliases,
+        ))
+
+    def snapshot(self):
+        """The current Snapshot; raises DataUnavailable if nothing could be loaded."""
+        snapshot = self.store.get()
+        if snapshot is None:
+            raise DataUnavailable(str(self.store.last_error or "no data loaded"))
+        return snapshot
+
+    def status(self):
+        snapshot = self.store.get()
+        return {
+            "version": snapshot.version if snapshot is not None else None,
+            "rows": snapshot.row_count if snapshot is not None else 0,
+            "fetched_at": snapshot.fetched_at if snapshot is not None else None,
+            "checked_at": self.store.checked_at,
+            "refreshing": self.store.refreshing,
+            "error": str(self.store.last_error) if self.store.last_error is not None else None,
+        }
+
+    def quality(self):
+        """What canonicalisation merged and how many duplicate rows it dropped."""
+        return self.snapshot().quality
+
+    # --- Lookups ---
+    def regions(self):
+        index = self.snapshot().index
+        return [{"code": region, "name": get_region_name(region)} for region in index.regions]
+
+    def staff(self):
+        return list(self.snapshot().index.staff)
+
+    def region_staff(self, region):
+        return list(self.snapshot().index.region_staff(region))
+
+    def projects(self, region):
+        index = self.snapshot().index
+        return [
+            {"project": project, "simple": index.is_simple(region, project)}
+            for project in index.region_projects(region)
+        ]
+
+    def sub_divisions(self, region, project):
+        return list(self.snapshot().index.subdivisions(region, project))
+
+    def positions(self, region, project, subdiv=None):
+        """
+        The Open Positions block for a simple project (subdiv None) or one
+        sub-division: supervising staff, the Manager Required flag and roles.
+        """
+        index = self.snapshot().index
+        staff = index.supervising_staff(region, project, subdiv)
+        supervising, manager_required = format_staff_for_display(staff)
+        return {
+            "region": region,
+            "project": project,
+            "sub_division": subdiv,
+            "staff": list(staff),
+            "supervising": supervising,
+            "manager_required": manager_required,
+            "roles": list(index.roles(region, project, subdiv)),
+        }
+
+    def staff_placements(self, staff):
+        """Every (region, project, sub-division) a staff member covers, with its roles."""
+        index = self.snapshot().index
+        placements = []
+        for region in index.staff_regions(staff):
+            for project in index.staff_projects(staff, region):
+                for subdiv in index.staff_subdivisions(staff, region, project):
+                    placements.append({
+                        "region": region,
+                        "project": project,
+                        "sub_division": subdiv,
+                        "simple": index.is_simple(region, project),
+                        "roles": list(index.staff_roles(staff, region, project, subdiv)),
+                    })
+        return placements
@@ -0,0 +1,181 @@
+"""
+Global search over regions, projects, sub-divisions, roles and staff.
+
+A SearchIndex is built once per snapshot from its RecruitmentIndex. Every
+searchable thing becomes a SearchHit whose label and context are split into
+words; the distinct words get a trigram inverted index. A query is answered by
+matching each of its terms against the word vocabulary (substring matches via
+trigram posting intersection, fuzzy matches via trigram overlap) and then
+intersecting the documents those words occur in, so the DataFrame is never
+scanned.
+"""
+import re
+from collections import Counter, defaultdict, namedtuple
+
+import numpy as np
+
+from recruitment.helpers import get_region_name
+
+# Result kinds, in the order they rank on equal scores
+KINDS = ("region", "staff", "project", "sub_division", "role")
+
+# Minimum trigram similarity for a fuzzy (non-substring) term match
+FUZZY_THRESHOLD = 0.35
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class SearchHit(namedtuple("SearchHit", "kind label context region project subdiv staff")):
+    """
+    One searchable entry. region/project/subdiv/staff say where it links to:
+    staff hits open the Staff view, every other kind the Region view drilled
+    down as far as project and subdiv go.
+    """
+
+    __slots__ = ()
+
+
+def _words(text):
+    return _WORD_RE.findall(str(text).casefold())
+
+
+def _doc_array(docs):
+    return np.fromiter(sorted(docs), dtype=np.int32, count=len(docs))
+
+
+def _region_context(region):
+    # Both the name and the code, so "engineer uae" finds UAE roles
+    name = get_region_name(region)
+    return name if name == region else f"{name} ({region})"
+
+
+def _trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, hits):
+        self.hits = tuple(hits)
+
+        vocabulary = {}
+        label_docs = defaultdict(set)
+        context_docs = defaultdict(set)
+        for doc_id, hit in enumerate(self.hits):
+            for word in _words(hit.label):
+                label_docs[vocabulary.setdefault(word, len(vocabulary))].add(doc_id)
+            for word in _words(hit.context):
+                context_docs[vocabulary.setdefault(word, len(vocabulary))].add(doc_id)
+
+        self._words = tuple(vocabulary)
+        self._label_docs = {word_id: _doc_array(docs) for word_id, docs in label_docs.items()}
+        self._context_docs = {word_id: _doc_array(docs) for word_id, docs in context_docs.items()}
+
+        # Tie-break order for equal scores: kind, then shorter labels first
+        order = np.lexsort((
+            [len(hit.label) for hit in self.hits],
+            [KINDS.index(hit.kind) for hit in self.hits],
+        ))
+        self._tie_rank = np.empty(len(self.hits), dtype=np.int64)
+        self._tie_rank[order] = np.arange(len(self.hits))
+
+        postings = defaultdict(list)
+        self._trigram_counts = []
+        for word_id, word in enumerate(self._words):
+            grams = _trigrams(word)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(word_id)
+        self._postings = {gram: tuple(ids) for gram, ids in postings.items()}
+
+    @classmethod
+    def from_index(cls, index):
+        """Collects every region, project, sub-division, role and staff member of a RecruitmentIndex."""
+        hits = []
+        for region in index.regions:
+            region_name = get_region_name(region)
+            hits.append(SearchHit("region", region_name, region, region, None, None, None))
+            region_context = _region_context(region)
+            for project in index.region_projects(region):
+                hits.append(SearchHit("project", project, region_context, region, project, None, None))
+                if index.is_simple(region, project):
+                    for role in index.roles(region, project):
+                        hits.append(SearchHit("role", role, f"{project}, {region_context}", region, project, None, None))
+                    continue
+                for subdiv in index.subdivisions(region, project):
+                    hits.append(SearchHit("sub_division", subdiv, f"{project}, {region_context}",
+                                          region, project, subdiv, None))
+                    for role in index.roles(region, project, subdiv):
+                        hits.append(SearchHit("role", role, f"{subdiv}, {project}, {region_context}",
+                                              region, project, subdiv, None))
+        for staff in index.staff:
+            regions = ", ".join(_region_context(region) for region in index.staff_regions(staff))
+            hits.append(SearchHit("staff", staff, regions, None, None, None, staff))
+        return cls(hits)
+
+    def __len__(self):
+        return len(self.hits)
+
+    def _match_term(self, term):
+        """Vocabulary word ids matching one query term, with a score in (0, 1]."""
+        if len(term) < 3:
+            # Too short for trigrams: the vocabulary is small, so scan it.
+            return {word_id: 1.0 for word_id, word in enumerate(self._words) if term in word}
+
+        inner = [term[i:i + 3] for i in range(len(term) - 2)]
+        candidates = None
+        for gram in inner:
+            ids = self._postings.get(gram, ())
+            candidates = set(ids) if candidates is None else candidates.intersection(ids)
+            if not candidates:
+                break
+        matches = {word_id: 1.0 for word_id in candidates or () if term in self._words[word_id]}
+
+        grams = _trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        for word_id, count in shared.items():
+            if word_id in matches:
+                continue
+            similarity = count / (len(grams) + self._trigram_counts[word_id] - count)
+            if similarity >= FUZZY_THRESHOLD:
+                matches[word_id] = similarity
+        return matches
+
+    def search(self, query, limit=20):
+        """
+        Hits matching every term of query, best first. Each term may match any
+        word of a hit's label or context as a substring or a close misspelling;
+        matches in the label score higher than matches in the context.
+        """
+        terms = _words(query)
+        if not terms:
+            return []
+
+        # Per-hit scores as dense arrays: a hit scores 0 once any term misses it.
+        scores = None
+        for term in terms:
+            term_scores = np.zeros(len(self.hits), dtype=np.float32)
+            for word_id, score in self._match_term(term).items():
+                for postings, weight in ((self._context_docs, 0.5), (self._label_docs, 1.0)):
+                    docs = postings.get(word_id)
+                    if docs is not None:
+                        term_scores[docs] = np.maximum(term_scores[docs], score * weight)
+            scores = term_scores if scores is None else np.where(scores > 0, scores + term_scores, 0)
+            scores[term_scores == 0] = 0
+
+        found = np.flatnonzero(scores)
+        if len(found) > limit:
+            # Keep the hits above the limit-th best score, then fill up with the
+            # best-placed ties, without sorting everything that matched.
+            cutoff = np.partition(scores[found], -limit)[-limit]
+            above = found[scores[found] > cutoff]
+            ties = found[scores[found] == cutoff]
+            need = limit - len(above)
+            if len(ties) > need:
+                ties = ties[np.argpartition(self._tie_rank[ties], need - 1)[:need]]
+            found = np.concatenate([above, ties])
+
+        found = found[np.lexsort((self._tie_rank[found], -scores[found]))]
+        return [self.hits[doc_id] for doc_id in found]
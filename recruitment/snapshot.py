@@ -0,0 +1,175 @@
+"""
+Immutable snapshots of the cleaned recruitment data.
+
+build_snapshot() turns one fetched payload into a Snapshot: the cleaned,
+canonicalised frame, its RecruitmentIndex and a version tag. A Snapshot is
+shared read-only by every session: its attributes cannot be set and frame()
+hands out shallow copies. derived() keeps artefacts computed from the
+snapshot (view models, search index, summary cube) on it, and after an
+incremental refresh patches the previous snapshot's copy instead of
+rebuilding it.
+"""
+import time
+
+from recruitment.canonical import Canonicalizer, fingerprint
+from recruitment.cleaning import clean_data, concat_cleaned
+from recruitment.diff import diff_frames
+from recruitment.index import IndexBuilder, build_index
+
+
+def snapshot_version(source, raw, aliases=None):
+    """Version of the Snapshot built from a payload: its digest plus the canonical rules' fingerprint."""
+    return f"{source.digest(raw)}-{fingerprint(aliases)}"
+
+
+def load_data(source, raw, canonicalizer=None):
+    """
+    Parses a payload fetched from `source` and returns the cleaned DataFrame,
+    canonicalised and without duplicate rows (see recruitment.canonical).
+    """
+    canonicalizer = canonicalizer or Canonicalizer()
+    return canonicalizer.collapse_duplicates(canonicalizer.apply(clean_data(source.read(raw))))
+
+
+def load_data_chunked(source, raw, chunksize, progress=None, with_index=True, canonicalizer=None):
+    """
+    Streaming variant of load_data for very large exports.
+
+    Each chunk is cleaned (and so turned into compact categoricals) and
+    canonicalised as soon as it is parsed and fed to the index builder, so the
+    full-size string frame and its cleaning temporaries never exist at once.
+    Duplicate rows are collapsed once all chunks are in; the index only
+    records distinct assignments, so it does not depend on that. Returns
+    (df, index), with index None when with_index is false; progress, if
+    given, is called with the fraction of the payload consumed.
+    """
+    canonicalizer = canonicalizer or Canonicalizer()
+    frames = []
+    builder = IndexBuilder() if with_index else None
+    for chunk, done in source.iter_chunks(raw, chunksize):
+        cleaned = canonicalizer.apply(clean_data(chunk))
+        if builder is not None:
+            builder.add(cleaned)
+        frames.append(cleaned)
+        if progress is not None:
+            progress(done)
+
+    if not frames:
+        df = load_data(source, raw, canonicalizer)
+        return df, build_index(df) if with_index else None
+    df = canonicalizer.collapse_duplicates(concat_cleaned(frames))
+    return df, builder.build() if with_index else None
+
+
+class Snapshot:
+    """
+    One immutable version of the recruitment data.
+
+    A single instance is shared by every session in the process, so nothing
+    handed out here may be mutated: the index only returns tuples, and
+    frame() returns a shallow copy whose columns can be reassigned freely
+    without touching the shared data.
+
+    A snapshot built from a previous one carries the row diff between them
+    (see recruitment.diff); derived() uses it to patch artefacts of the
+    previous snapshot instead of rebuilding them.
+    """
+
+    __slots__ = ("_df", "_index", "_version", "_fetched_at", "_diff", "_quality", "_derived", "_previous_derived")
+
+    def __init__(self, df, index, version, fetched_at, diff=None, previous=None, quality=None):
+        object.__setattr__(self, "_df", df)
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_version", version)
+        object.__setattr__(self, "_fetched_at", fetched_at)
+        object.__setattr__(self, "_diff", diff)
+        object.__setattr__(self, "_quality", quality)
+        object.__setattr__(self, "_derived", {})
+        # Only the previous snapshot's artefacts are kept, never its frame.
+        object.__setattr__(self, "_previous_derived", dict(previous._derived) if previous is not None else {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is read-only")
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def fetched_at(self):
+        return self._fetched_at
+
+    @property
+    def diff(self):
+        """SnapshotDiff against the previous snapshot, or None after a full build."""
+        return self._diff
+
+    @property
+    def quality(self):
+        """Data-quality report of the canonicalisation stage (see Canonicalizer.report), or None."""
+        return self._quality
+
+    @property
+    def row_count(self):
+        return len(self._df)
+
+    @property
+    def empty(self):
+        return self._df.empty
+
+    def frame(self):
+        return self._df.copy(deep=False)
+
+    def derived(self, name, build, update=None):
+        """
+        Returns the artefact `name` computed from this snapshot, building it on
+        first use as build(snapshot). When the previous snapshot had already
+        built it and there is a diff, update(previous_artefact, snapshot) is
+        called instead, so only the partitions the diff touches are redone.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            previous = self._previous_derived.pop(name, None)
+            if previous is not None and update is not None and self._diff is not None:
+                value = update(previous, self)
+            else:
+                value = build(self)
+            self._derived[name] = value
+        return value
+
+
+def build_snapshot(source, raw, version=None, fetched_at=None, chunksize=None, progress=None, previous=None,
+                   aliases=None):
+    """
+    Cleans, canonicalises and indexes a payload; aliases extends the alias
+    tables of recruitment.canonical, and the data-quality report is kept on
+    the Snapshot. With a chunksize the payload is streamed in chunks. With a
+    previous Snapshot, the new rows are diffed against it and only the index
+    partitions of the regions and staff that changed are rebuilt.
+    """
+    incremental = previous is not None and not previous.empty
+    canonicalizer = Canonicalizer(aliases)
+    if chunksize:
+        df, index = load_data_chunked(source, raw, chunksize, progress, not incremental, canonicalizer)
+    else:
+        df = load_data(source, raw, canonicalizer)
+        index = None if incremental else build_index(df)
+
+    diff = None
+    if incremental:
+        diff = diff_frames(previous._df, df, previous.version)
+        index = previous.index.with_partitions(df, diff.affected_regions, diff.affected_staff)
+
+    return Snapshot(
+        df,
+        index,
+        version or snapshot_version(source, raw, aliases),
+        fetched_at if fetched_at is not None else time.time(),
+        diff,
+        previous if incremental else None,
+        canonicalizer.report(),
+    )
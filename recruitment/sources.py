@@ -0,0 +1,253 @@
+"""
+Where the recruitment sheet comes from.
+
+Every source follows the same two-step protocol so the store can revalidate
+cheaply and hash what it downloaded before paying for a parse:
+
+    result = source.fetch(validators)   # raw payload, or not_modified
+    df = source.read(result.raw)        # raw DataFrame, all columns str
+
+open_source() turns the XAD_DATA_SOURCE setting into a source: URLs become
+GoogleSheetSource, .xlsx/.xlsm paths XlsxFileSource, other paths
+CsvFileSource, and a comma-separated list becomes a MultiSource.
+"""
+import hashlib
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pandas as pd
+
+FETCH_TIMEOUT = 30  # seconds
+
+SHEET_EXPORT_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
+
+
+def sheet_export_url(sheet_id, gid):
+    """CSV export URL for one tab of a Google Sheet."""
+    return SHEET_EXPORT_URL.format(sheet_id=sheet_id, gid=gid)
+
+
+# The XAD recruitment sheet, used unless XAD_DATA_SOURCE says otherwise
+DEFAULT_SHEET_URL = sheet_export_url("1HDXLPqdZh3FlK_dmLzi-TzgPMNh9CLk_eMJjLK5g-uY", 249760352)
+
+
+class FetchResult:
+    """
+    Outcome of a fetch. raw is None when the source is unchanged since the
+    validators that were passed in; validators are what to send next time.
+    """
+
+    __slots__ = ("raw", "validators")
+
+    def __init__(self, raw, validators=None):
+        self.raw = raw
+        self.validators = validators
+
+    @property
+    def not_modified(self):
+        return self.raw is None
+
+
+class DataSource:
+    """Base class for sheet sources. Subclasses implement fetch() and read()."""
+
+    name = ""
+
+    def fetch(self, validators=None):
+        raise NotImplementedError
+
+    def read(self, raw):
+        raise NotImplementedError
+
+    def digest(self, raw):
+        """Version tag for a payload: identical content gives an identical digest."""
+        return hashlib.sha256(raw).hexdigest()[:16]
+
+    def iter_chunks(self, raw, chunksize):
+        """
+        Yields (frame, fraction_done) pieces of the payload of at most
+        chunksize rows. Sources that cannot stream yield a single piece.
+        """
+        yield self.read(raw), 1.0
+
+    def load(self):
+        """Fetches and reads in one go, ignoring validators."""
+        return self.read(self.fetch().raw)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+def _read_csv(raw):
+    # Read all as string initially to avoid type errors
+    return pd.read_csv(io.BytesIO(raw), dtype=str)
+
+
+def _iter_csv_chunks(raw, chunksize):
+    buffer = io.BytesIO(raw)
+    total = max(len(raw), 1)
+    with pd.read_csv(buffer, dtype=str, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield chunk, min(buffer.tell() / total, 1.0)
+
+
+class GoogleSheetSource(DataSource):
+    """
+    CSV export of a Google Sheet tab (or any CSV over HTTP).
+
+    Validators from the previous response are sent as If-None-Match /
+    If-Modified-Since so an unchanged sheet costs a 304 instead of a download.
+    """
+
+    def __init__(self, url, timeout=FETCH_TIMEOUT):
+        self.name = url
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self, validators=None):
+        validators = validators or {}
+        request = Request(self.url)
+        if validators.get("etag"):
+            request.add_header("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.add_header("If-Modified-Since", validators["last_modified"])
+
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return FetchResult(response.read(), {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                })
+        except HTTPError as e:
+            if e.code == 304:
+                return FetchResult(None, validators)
+            raise
+
+    def read(self, raw):
+        return _read_csv(raw)
+
+    def iter_chunks(self, raw, chunksize):
+        return _iter_csv_chunks(raw, chunksize)
+
+
+class _LocalFileSource(DataSource):
+    """A file on disk; its size and mtime act as the validators."""
+
+    def __init__(self, path):
+        self.name = os.path.abspath(path)
+        self.path = path
+
+    def fetch(self, validators=None):
+        stat = os.stat(self.path)
+        current = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        if validators == current:
+            return FetchResult(None, current)
+        with open(self.path, "rb") as f:
+            return FetchResult(f.read(), current)
+
+
+class CsvFileSource(_LocalFileSource):
+    """Local CSV export of the sheet."""
+
+    def read(self, raw):
+        return _read_csv(raw)
+
+    def iter_chunks(self, raw, chunksize):
+        return _iter_csv_chunks(raw, chunksize)
+
+
+class XlsxFileSource(_LocalFileSource):
+    """
+    Local XLSX workbook. sheet_name picks one tab; the default None reads
+    every tab and stacks them, so a workbook split per region loads as one sheet.
+    """
+
+    def __init__(self, path, sheet_name=None):
+        super().__init__(path)
+        self.sheet_name = sheet_name
+        if sheet_name is not None:
+            self.name = f"{self.name}#{sheet_name}"
+
+    def read(self, raw):
+        frames = pd.read_excel(io.BytesIO(raw), sheet_name=self.sheet_name, dtype=str, engine="openpyxl")
+        if isinstance(frames, dict):
+            return _concat(frames.values())
+        return frames
+
+
+def _concat(frames):
+    frames = list(frames)
+    for frame in frames:
+        frame.columns = [str(c).strip() for c in frame.columns]
+    return pd.concat(frames, ignore_index=True)
+
+
+class MultiSource(DataSource):
+    """
+    Several sources (e.g. one tab per region) fetched concurrently on a thread
+    pool and stacked into one sheet.
+
+    The payload is a tuple with one entry per part. Parts that come back
+    not_modified reuse their previous payload, so only changed tabs are
+    downloaded; the whole source is not_modified only when every part is.
+    """
+
+    def __init__(self, sources, max_workers=None):
+        self.sources = list(sources)
+        self.name = ",".join(source.name for source in self.sources)
+        self.max_workers = max_workers or min(8, len(self.sources))
+        self._last_raw = [None] * len(self.sources)
+
+    def _map(self, func, *iterables):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sheet-source") as pool:
+            return list(pool.map(func, *iterables))
+
+    def fetch(self, validators=None):
+        previous = validators or [None] * len(self.sources)
+        if len(previous) != len(self.sources) or None in self._last_raw:
+            # Without every part's last payload, a 304 could not be filled in.
+            previous = [None] * len(self.sources)
+
+        results = self._map(lambda source, v: source.fetch(v), self.sources, previous)
+        new_validators = [result.validators for result in results]
+        if all(result.not_modified for result in results):
+            return FetchResult(None, new_validators)
+
+        raw = tuple(
+            last if result.not_modified else result.raw
+            for result, last in zip(results, self._last_raw)
+        )
+        self._last_raw = list(raw)
+        return FetchResult(raw, new_validators)
+
+    def read(self, raw):
+        return _concat(self._map(lambda source, part: source.read(part), self.sources, raw))
+
+    def iter_chunks(self, raw, chunksize):
+        # Parts are streamed one after another: chunked mode trades the
+        # parallel parse of read() for bounded memory.
+        count = len(self.sources)
+        for i, (source, part) in enumerate(zip(self.sources, raw)):
+            for chunk, done in source.iter_chunks(part, chunksize):
+                chunk.columns = [str(c).strip() for c in chunk.columns]
+                yield chunk, (i + done) / count
+
+    def digest(self, raw):
+        parts = "".join(source.digest(part) for source, part in zip(self.sources, raw))
+        return hashlib.sha256(parts.encode()).hexdigest()[:16]
+
+
+def open_source(spec):
+    """Builds a source from a URL, a file path, or a comma-separated list of them."""
+    parts = [part.strip() for part in spec.split(",") if part.strip()]
+    if len(parts) > 1:
+        return MultiSource(open_source(part) for part in parts)
+    location = parts[0]
+    if location.startswith(("http://", "https://")):
+        return GoogleSheetSource(location)
+    if location.lower().endswith((".xlsx", ".xlsm")):
+        return XlsxFileSource(location)
+    return CsvFileSource(location)
@@ -0,0 +1,270 @@
+"""
+Static HTML mirror of the Home, Region and Staff pages.
+
+    python -m recruitment.static_site --out site/
+
+One pass over the snapshot's index renders every Region page and every Staff
+page (including the Manager Required page) from the same view models the app
+uses. Drill-downs are nested <details> elements, so the mirror needs no
+JavaScript and any static file server can host it.
+
+Pages are compared by content hash with the manifest of the previous build
+in the same directory: unchanged pages are left untouched on disk, pages that
+no longer exist are removed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from html import escape
+
+from recruitment.helpers import get_region_name
+from recruitment.viewmodels import build_home_view, build_region_view, build_staff_view, staff_headings
+
+MANIFEST_FILE = "manifest.json"
+
+STYLESHEET = """\
+body { font-family: system-ui, sans-serif; margin: 0 auto; max-width: 1200px; padding: 1rem 2rem; color: #31333F; }
+nav { margin-bottom: 1rem; }
+a { color: #2b7bba; text-decoration: none; }
+h1 { font-size: 2.2rem; margin-bottom: 1rem; }
+h2 { font-size: 1.5rem; margin-top: 1.5rem; margin-bottom: 0.5rem; }
+.caption { font-size: 0.9rem; color: #666; margin-bottom: 10px; }
+.layout { display: flex; gap: 2rem; }
+.content { flex: 3; }
+aside { flex: 1; }
+ul.buttons { list-style: none; padding: 0; display: flex; flex-wrap: wrap; gap: 0.5rem; }
+ul.buttons a, summary { display: inline-block; padding: 0.5rem 1rem; border: 1px solid #d6d6d8;
+    border-radius: 0.5rem; background: #f0f2f6; white-space: nowrap; cursor: pointer; }
+details { margin: 0.5rem 0; }
+details[open] > summary { background: #e6f3ff; border-color: #2b7bba; }
+details > div { margin: 0.5rem 0 0.5rem 1.5rem; }
+.warning { font-weight: bold; }
+footer { margin-top: 2rem; font-size: 0.8rem; color: #666; }
+"""
+
+PAGE_TEMPLATE = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · XAD Recruitment Details</title>
+<link rel="stylesheet" href="{root}style.css">
+</head>
+<body>
+<nav><a href="{root}index.html">🏠 Home</a></nav>
+<main>
+<h1>{title}</h1>
+{body}
+</main>
+</body>
+</html>
+"""
+
+
+def _slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(name)).strip("-").lower() or "page"
+
+
+def _assign_paths(names, folder):
+    """Stable, file-name-safe path per name; colliding slugs get a hash suffix."""
+    paths = {}
+    taken = set()
+    for name in names:
+        slug = _slug(name)
+        if slug in taken:
+            slug = f"{slug}-{hashlib.sha256(str(name).encode()).hexdigest()[:8]}"
+        taken.add(slug)
+        paths[name] = f"{folder}/{slug}.html"
+    return paths
+
+
+def _page(title, body, root=""):
+    return PAGE_TEMPLATE.format(title=escape(title), body=body, root=root)
+
+
+def _links(items, paths, root, label=str):
+    entries = "".join(
+        f'<li><a href="{root}{escape(paths[item])}">{escape(label(item))}</a></li>' for item in items
+    )
+    return f'<ul class="buttons">{entries}</ul>'
+
+
+def _roles(roles):
+    return "<ul>" + "".join(f"<li>{escape(role)}</li>" for role in roles) + "</ul>"
+
+
+def _positions(heading, positions, flagged_name, flagged_kind):
+    html = f"<h3>{escape(heading)}</h3><p><strong>Supervising Staff:</strong> {escape(positions.supervising)}</p>"
+    if positions.manager_required:
+        html += f'<p class="warning">⚠️ Manager required for {escape(flagged_name)} {flagged_kind}.</p>'
+    return html + _roles(positions.roles)
+
+
+def render_home(home, region_paths, staff_paths, snapshot):
+    body = (
+        "<h2>Browse by Region</h2>"
+        '<p class="caption">See all current projects in a specific region.</p>'
+        + _links(home.regions, region_paths, "", get_region_name)
+        + "<h2>Browse by Recruitment Staff</h2>"
+        '<p class="caption">See all sub-divisions managed by a specific staff member.</p>'
+        + _links(home.staff, staff_paths, "")
+        + f"<footer>Data version {escape(snapshot.version)}, fetched "
+        f"{time.strftime('%Y-%m-%d %H:%M UTC', time.gmtime(snapshot.fetched_at))}.</footer>"
+    )
+    return _page("XAD Recruitment Details", body)
+
+
+def render_region(model, staff_paths):
+    parts = [
+        '<div class="layout"><section class="content"><h2>Projects</h2>'
+        '<p class="caption">Select a project to view sub-divisions or positions.</p>'
+    ]
+    for project in model.projects:
+        parts.append(f"<details><summary>{escape(project)}</summary><div>")
+        if project in model.simple:
+            parts.append(_positions(f"Open Positions in {project}", model.positions[(project, None)],
+                                    project, "project"))
+        else:
+            parts.append(f"<h3>Sub-divisions for {escape(project)}</h3>")
+            for subdiv in model.subdivisions[project]:
+                parts.append(f"<details><summary>{escape(subdiv)}</summary><div>")
+                parts.append(_positions(f"Open Positions in {subdiv}", model.positions[(project, subdiv)],
+                                        subdiv, "sub-division"))
+                parts.append("</div></details>")
+        parts.append("</div></details>")
+    parts.append(
+        "</section><aside><h2>Staff in this Region</h2>"
+        '<p class="caption">Recruitment staff active in this region.</p>'
+        + _links(model.staff, staff_paths, "../")
+        + "</aside></div>"
+    )
+    return _page(f"Region: {model.name}", "".join(parts), "../")
+
+
+def render_staff(model, index, region_paths):
+    headings = staff_headings(model.staff)
+    caption = f'<p class="caption">{escape(headings.caption)}</p>'
+
+    def drill_down(region, project, subdiv):
+        roles = index.staff_roles(model.staff, region, project, subdiv)
+        return (f"<details><summary>{escape(subdiv)}</summary><div>"
+                f"<p><strong>Open Positions in {escape(subdiv)}:</strong></p>{_roles(roles)}</div></details>")
+
+    parts = ['<div class="layout"><section class="content">']
+    for section in model.sections:
+        if section.simple_projects:
+            parts.append(f"<h2>{escape(headings.project_heading)} {escape(section.name)}</h2>{caption}")
+            parts.extend(drill_down(section.region, project, project) for project in section.simple_projects)
+        for project, subdivs in section.complex_projects:
+            parts.append(f"<h2>{escape(headings.subdivision_heading)} {escape(project)} "
+                         f"({escape(section.name)})</h2>{caption}")
+            parts.extend(drill_down(section.region, project, subdiv) for subdiv in subdivs)
+    parts.append(
+        "</section><aside><h2>Associated Regions</h2>"
+        '<p class="caption">Regions where this staff member is active.</p>'
+        + _links(model.regions, region_paths, "../", get_region_name)
+        + "</aside></div>"
+    )
+    return _page(headings.title, "".join(parts), "../")
+
+
+def render_site(snapshot):
+    """Yields (relative path, html) for every page of the mirror."""
+    index = snapshot.index
+    home = build_home_view(index)
+    region_paths = _assign_paths(home.regions, "regions")
+    staff_paths = _assign_paths(home.staff, "staff")
+
+    yield "index.html", render_home(home, region_paths, staff_paths, snapshot)
+    yield "style.css", STYLESHEET
+    for region in home.regions:
+        yield region_paths[region], render_region(build_region_view(index, region), staff_paths)
+    for staff in home.staff:
+        yield staff_paths[staff], render_staff(build_staff_view(index, staff), index, region_paths)
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f).get("pages", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def build_site(snapshot, out_dir):
+    """
+    Renders the mirror into out_dir, rewriting only pages whose content hash
+    changed since the last build there. Returns counts of written, reused
+    and removed pages.
+    """
+    previous = _load_manifest(out_dir)
+    pages = {}
+    written = reused = 0
+    for rel_path, html in render_site(snapshot):
+        content = html.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        pages[rel_path] = digest
+        path = os.path.join(out_dir, rel_path)
+        if previous.get(rel_path) == digest and os.path.exists(path):
+            reused += 1
+            continue
+        _write(path, content)
+        written += 1
+
+    removed = 0
+    for rel_path in previous.keys() - pages.keys():
+        try:
+            os.remove(os.path.join(out_dir, rel_path))
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    manifest = {"version": snapshot.version, "built_at": time.time(), "pages": pages}
+    _write(os.path.join(out_dir, MANIFEST_FILE), json.dumps(manifest, indent=1).encode("utf-8"))
+    return {"written": written, "reused": reused, "removed": removed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every Region and Staff page to static HTML.")
+    parser.add_argument("--out", default="site", help="output directory (default: %(default)s)")
+    parser.add_argument("--source", default=os.environ.get("XAD_DATA_SOURCE"),
+                        help="sheet URL, .csv/.xlsx path or comma-separated list (default: XAD_DATA_SOURCE, "
+                             "else the XAD Google Sheet)")
+    parser.add_argument("--cache-dir", default=os.environ.get("XAD_CACHE_DIR", ""),
+                        help="snapshot cache directory to read from and update")
+    parser.add_argument("--aliases", default=os.environ.get("XAD_ALIASES", ""),
+                        help="JSON file of extra spellings to canonicalise (see recruitment.canonical)")
+    args = parser.parse_args()
+
+    from recruitment.query import RecruitmentQuery
+    from recruitment.sources import DEFAULT_SHEET_URL
+
+    query = RecruitmentQuery.open(
+        args.source or DEFAULT_SHEET_URL, cache_dir=args.cache_dir or None, aliases=args.aliases or None
+    )
+    snapshot = query.snapshot()
+    if query.store.refreshing:
+        # Loaded from the disk cache: build from the latest sheet, not the cached copy.
+        query.store.refresh()
+        snapshot = query.snapshot()
+
+    start = time.perf_counter()
+    stats = build_site(snapshot, args.out)
+    print(f"{stats['written']} pages written, {stats['reused']} unchanged, {stats['removed']} removed "
+          f"in {time.perf_counter() - start:.2f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+SnapshotStore: fetches the sheet, revalidates it and swaps Snapshots in for
+the whole process, optionally backed by the disk cache of recruitment.persist.
+"""
+import threading
+import time
+
+from recruitment.canonical import fingerprint
+from recruitment.persist import load_snapshot, save_snapshot
+from recruitment.snapshot import build_snapshot, snapshot_version
+
+
+class SnapshotStore:
+    """
+    Process-wide holder of the current Snapshot.
+
+    The app keeps exactly one store per process (via st.cache_resource), so
+    every session reads the same Snapshot object instead of its own copy.
+
+    Once refresh_interval seconds have passed since the last attempt, get()
+    keeps returning the current Snapshot and starts a single background worker
+    that revalidates the sheet and swaps the new Snapshot in when it is ready
+    (stale-while-revalidate). A failed refresh keeps the last good Snapshot.
+
+    With a cache_dir, every good Snapshot is also written to disk, and a cold
+    start serves the copy on disk at once while revalidating in the background.
+
+    With a chunksize, exports are cleaned and indexed chunk by chunk to bound
+    peak memory on very large sheets. A changed sheet is diffed against the
+    current Snapshot, so a refresh rebuilds only what the changed rows touch.
+
+    aliases extends the alias tables used to canonicalise every build (see
+    recruitment.canonical). A disk copy built under other alias tables is
+    not served; the sheet is fetched and rebuilt instead.
+    """
+
+    def __init__(self, source, refresh_interval=0, cache_dir=None, chunksize=None, aliases=None):
+        self.source = source
+        self.refresh_interval = refresh_interval
+        self.cache_dir = cache_dir
+        self.chunksize = chunksize
+        self.aliases = aliases
+        self.rules = fingerprint(aliases)
+        self.last_error = None
+        self.checked_at = None
+        self._snapshot = None
+        self._loaded = False
+        self._attempted_at = None
+        self._validators = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._worker = None
+
+    @property
+    def loaded(self):
+        """False until the first load (from disk or the source) has finished."""
+        return self._loaded
+
+    @property
+    def refreshing(self):
+        worker = self._worker
+        return worker is not None and worker.is_alive()
+
+    def get(self, progress=None):
+        """
+        Returns the current Snapshot, or None if nothing could be loaded yet.
+        progress is passed on to the first, blocking load (see build_snapshot).
+        """
+        if not self._loaded:
+            with self._fetch_lock:
+                if not self._loaded and not self._load_from_disk():
+                    self._load(progress)
+        if self._is_stale():
+            self.refresh_in_background()
+        return self._snapshot
+
+    def refresh(self):
+        """
+        Revalidates the sheet and swaps in a new Snapshot only if it changed.
+
+        Returns True when the data changed. An unchanged sheet (304 from the
+        server, or identical bytes) keeps the current Snapshot and its index
+        and only moves checked_at forward. If a background refresh is already
+        running, waits for it instead of starting a second download.
+        """
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            before = self._snapshot
+            worker.join()
+            return self._snapshot is not before
+
+        with self._fetch_lock:
+            before = self._snapshot
+            self._load()
+            return self._snapshot is not before
+
+    def refresh_in_background(self):
+        """Starts the refresh worker unless one is already running. Returns True if started."""
+        with self._lock:
+            if self.refreshing:
+                return False
+            self._worker = threading.Thread(
+                target=self._background_refresh, name="snapshot-refresh", daemon=True
+            )
+            self._worker.start()
+            return True
+
+    def request_refresh(self):
+        """
+        Refresh triggered by a user: runs in the background while there is a
+        Snapshot to keep serving, inline when there is nothing to show yet.
+        """
+        if self._snapshot is None:
+            self.refresh()
+        else:
+            self.refresh_in_background()
+
+    def _is_stale(self):
+        if self._attempted_at is None:
+            # Served from the disk cache and not yet checked against the source.
+            return self._loaded
+        if not self.refresh_interval:
+            return False
+        return time.time() - self._attempted_at >= self.refresh_interval
+
+    def _load_from_disk(self):
+        if not self.cache_dir:
+            return False
+        cached = load_snapshot(self.cache_dir, self.source.name, self.rules)
+        if cached is None:
+            return False
+        self._snapshot, meta = cached
+        self._validators = meta.get("validators")
+        self.checked_at = meta.get("checked_at")
+        self._loaded = True
+        return True
+
+    def _background_refresh(self):
+        # The fetch lock also covers a concurrent refresh() or first load, so
+        # two downloads never run at the same time.
+        with self._fetch_lock:
+            self._load()
+
+    def _load(self, progress=None):
+        current = self._snapshot
+        self._attempted_at = time.time()
+        try:
+            result = self.source.fetch(self._validators if current is not None else None)
+            now = time.time()
+
+            if not result.not_modified:
+                version = snapshot_version(self.source, result.raw, self.aliases)
+                if current is None or current.version != version:
+                    self._snapshot = build_snapshot(
+                        self.source, result.raw, version, now, self.chunksize, progress,
+                        previous=current, aliases=self.aliases,
+                    )
+
+            self._validators = result.validators
+            self.checked_at = now
+            self.last_error = None
+            # An unchanged sheet is already on disk; only a new version is written
+            if self.cache_dir and self._snapshot is not current:
+                save_snapshot(
+                    self.cache_dir, self._snapshot, self.source.name, now, self._validators, self.rules
+                )
+        except Exception as e:
+            # Keep serving the last good Snapshot, if there is one.
+            self.last_error = e
+        self._loaded = True
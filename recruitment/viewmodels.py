@@ -0,0 +1,184 @@
+"""
+Render-ready data for the Home, Region and Staff views.
+
+Each builder turns index lookups into the lists a view draws, already split,
+sorted and formatted. ViewModelCache memoises them per (snapshot version,
+view, region or staff) in one LRU shared by every session, so a popular page
+is computed once and then served from memory until the data changes.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+
+from recruitment.helpers import format_staff_for_display, get_region_name
+
+HomeView = namedtuple("HomeView", "regions region_labels region_by_label staff")
+
+# One "Open Positions" block: supervising staff line, Manager Required flag and roles
+Positions = namedtuple("Positions", "supervising manager_required roles")
+NO_POSITIONS = Positions("None", False, ())
+
+# positions is keyed by (project, sub_division), with sub_division None for simple projects
+RegionView = namedtuple("RegionView", "region name staff projects simple subdivisions positions")
+
+# complex_projects is a tuple of (project, sub_divisions) pairs
+StaffSection = namedtuple("StaffSection", "region name simple_projects complex_projects")
+
+StaffView = namedtuple("StaffView", "staff regions sections")
+
+StaffHeadings = namedtuple("StaffHeadings", "title project_heading subdivision_heading caption")
+
+
+def staff_headings(staff):
+    """Page title and section texts of a Staff page; 'Manager Required' gets its own wording."""
+    if staff == "Manager Required":
+        return StaffHeadings(
+            "Vacant Management Positions",
+            "Projects in",
+            "Sub-divisions in",
+            "Managers are required for the following sub-divisions.",
+        )
+    return StaffHeadings(
+        f"Recruitment Staff: {staff}",
+        "Managed projects in",
+        "Managed sub-divisions in",
+        "Click to view open positions.",
+    )
+
+
+def _positions(index, region, project, subdiv=None):
+    supervising, manager_required = format_staff_for_display(index.supervising_staff(region, project, subdiv))
+    return Positions(supervising, manager_required, index.roles(region, project, subdiv))
+
+
+def build_home_view(index, key=None):
+    labels = tuple(get_region_name(region) for region in index.regions)
+    return HomeView(
+        index.regions,
+        labels,
+        MappingProxyType(dict(zip(labels, index.regions))),
+        index.staff,
+    )
+
+
+def build_region_view(index, region):
+    projects = index.region_projects(region)
+    simple = frozenset(project for project in projects if index.is_simple(region, project))
+    subdivisions = {}
+    positions = {}
+    for project in projects:
+        if project in simple:
+            positions[(project, None)] = _positions(index, region, project)
+            continue
+        subdivisions[project] = index.subdivisions(region, project)
+        for subdiv in subdivisions[project]:
+            positions[(project, subdiv)] = _positions(index, region, project, subdiv)
+    return RegionView(
+        region,
+        get_region_name(region),
+        index.region_staff(region),
+        projects,
+        simple,
+        MappingProxyType(subdivisions),
+        MappingProxyType(positions),
+    )
+
+
+def build_staff_view(index, staff):
+    sections = []
+    for region in index.staff_regions(staff):
+        simple_projects = []
+        complex_projects = []
+        for project in index.staff_projects(staff, region):
+            if index.is_simple(region, project):
+                simple_projects.append(project)
+            else:
+                complex_projects.append((project, index.staff_subdivisions(staff, region, project)))
+        sections.append(StaffSection(region, get_region_name(region), tuple(simple_projects), tuple(complex_projects)))
+    return StaffView(staff, index.staff_regions(staff), tuple(sections))
+
+
+BUILDERS = {
+    "home": build_home_view,
+    "region": build_region_view,
+    "staff": build_staff_view,
+}
+
+
+def _touched(kind, key, model, diff):
+    """Whether a view model of the previous snapshot is out of date after diff."""
+    if kind == "region":
+        return key in diff.affected_regions
+    if kind == "staff":
+        # Simple/complex splits depend on other staff's rows in the same regions.
+        return key in diff.affected_staff or not diff.affected_regions.isdisjoint(model.regions)
+    return True
+
+
+class ViewModelCache:
+    """
+    Size-bounded LRU of view models, shared by every session in the process.
+
+    Entries are keyed by (snapshot version, view, region or staff). On a new
+    version, models of the previous snapshot that its diff did not touch are
+    carried over instead of rebuilt; older versions simply age out.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.carried = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, snapshot, kind, key=None):
+        cache_key = (snapshot.version, kind, key)
+        diff = snapshot.diff
+        with self._lock:
+            model = self._entries.get(cache_key)
+            if model is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return model
+            if diff is not None:
+                previous = self._entries.get((diff.previous_version, kind, key))
+                if previous is not None and not _touched(kind, key, previous, diff):
+                    model = previous
+                    self.carried += 1
+
+        if model is None:
+            # Built outside the lock; two sessions racing on a miss just build twice.
+            model = BUILDERS[kind](snapshot.index, key)
+            self.misses += 1
+
+        with self._lock:
+            self._entries[cache_key] = model
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return model
+
+    def warm(self, snapshot):
+        """
+        Builds the Home model, then every Region and Staff model, stopping
+        before the LRU would start evicting what it just built. Returns the
+        number of models now cached for this snapshot.
+        """
+        index = snapshot.index
+        keys = [("home", None)]
+        keys += [("region", region) for region in index.regions]
+        keys += [("staff", staff) for staff in index.staff]
+        keys = keys[:self.maxsize]
+        for kind, key in keys:
+            self.get(snapshot, kind, key)
+        return len(keys)
+
+    def info(self):
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "carried": self.carried,
+        }
@@ -0,0 +1,28 @@
+import pytest
+
+HEADER = "Region,Staff_Lead,Project,Sub_Division,Role,Notes"
+
+# A small sheet with the usual hand-edited blemishes: padded cells, blank
+# Project/Sub_Division pairs, blank staff and roles.
+SAMPLE_ROWS = [
+    "UAE,Alice,Tower,Tower,Engineer,",
+    "UAE ,Alice,Tower,,Architect,x",
+    "UAE,Bob,Metro,Line 1,Driver,",
+    "UAE,Manager Required,Metro,Line 2,Planner,",
+    "KSA,Bob,,Riyadh Hub,Analyst,",
+    "KSA,,Desert,Desert,Surveyor,",
+    ",Carol,,,Clerk,",
+    "UK,Carol,Bridge,North,  ,",
+    "UK,Carol,Bridge,South,Welder,",
+    "UAE,Dana,Metro,Line 3,Welder,",
+]
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Writes rows (without header) to a CSV file in tmp_path and returns its path."""
+    def write(rows, name="sheet.csv"):
+        path = tmp_path / name
+        path.write_text("\n".join([HEADER, *rows]) + "\n", encoding="utf-8")
+        return str(path)
+    return write
@@ -0,0 +1,66 @@
+import io
+
+import pandas as pd
+
+from recruitment.canonical import Canonicalizer, fingerprint, fold
+from recruitment.cleaning import clean_data
+from tests.conftest import HEADER
+
+
+def canonicalize(rows, aliases=None):
+    canonicalizer = Canonicalizer(aliases)
+    df = clean_data(pd.read_csv(io.StringIO("\n".join([HEADER, *rows])), dtype=str))
+    return canonicalizer.collapse_duplicates(canonicalizer.apply(df)), canonicalizer.report()
+
+
+def test_fold_ignores_case_and_whitespace():
+    assert fold("  United   Arab Emirates ") == fold("united arab emirates")
+    assert fold("Metro") != fold("Metro 2")
+
+
+def test_spellings_fold_to_one_value():
+    df, report = canonicalize([
+        "UAE,Alice,Metro,Line 1,Driver,",
+        "uae,alice,metro,line 1,driver,",
+        "United Arab Emirates,ALICE,METRO,Line  1,Driver,",
+        "KSA,manager required,Desert,Desert,Surveyor,",
+    ])
+
+    assert list(df["Region"].unique()) == ["UAE", "KSA"]
+    # The first spelling met wins, unless one is preferred
+    assert list(df["Staff_Lead"].unique()) == ["Alice", "Manager Required"]
+    assert list(df["Sub_Division"].unique()) == ["Line 1", "Desert"]
+    assert report["variants"]["Region"] == {"UAE": ["United Arab Emirates", "uae"]}
+    assert report["merged_spellings"]["Staff_Lead"] == 3
+
+
+def test_duplicates_left_by_folding_are_collapsed():
+    df, report = canonicalize([
+        "UAE,Alice,Metro,Line 1,Driver,",
+        "uae,Alice,Metro,Line 1,Driver,",
+        "UAE,Alice,Metro,Line 1,Driver,x",
+    ])
+
+    assert len(df) == 2
+    assert (report["rows_in"], report["rows_out"], report["duplicate_rows"]) == (3, 2, 1)
+
+
+def test_aliases_extend_the_defaults():
+    df, _ = canonicalize(
+        ["U.A.E.,TBD,Metro,Line 1,Driver,", "Kingdom of Saudi Arabia,Bob,Desert,Desert,Surveyor,"],
+        {"Region": {"u.a.e.": "UAE"}, "Staff_Lead": {"TBD": "Manager Required"}},
+    )
+
+    assert list(df["Region"]) == ["UAE", "KSA"]
+    assert list(df["Staff_Lead"]) == ["Manager Required", "Bob"]
+
+
+def test_project_aliases_apply_to_sub_divisions():
+    df, _ = canonicalize(["UAE,Alice,Metro Rail,,Driver,"], {"Project": {"Metro Rail": "Metro"}})
+
+    assert (df.loc[0, "Project"], df.loc[0, "Sub_Division"]) == ("Metro", "Metro")
+
+
+def test_fingerprint_follows_the_alias_tables():
+    assert fingerprint() == fingerprint({})
+    assert fingerprint({"Region": {"U.A.E.": "UAE"}}) != fingerprint()
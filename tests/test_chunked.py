@@ -0,0 +1,45 @@
+import pandas as pd
+
+from recruitment.snapshot import build_snapshot
+from recruitment.sources import open_source
+from recruitment.store import SnapshotStore
+from tests.conftest import SAMPLE_ROWS
+
+
+def test_chunks_with_and_without_blank_fills_concatenate(write_csv):
+    # Only the second chunk needs the "Unspecified" fill for Staff_Lead
+    path = write_csv([
+        "UAE,Alice,Tower,Tower,Engineer,",
+        "UAE,Bob,Metro,Line 1,Driver,",
+        "KSA,,Desert,Desert,Surveyor,",
+        ",Carol,,,Clerk,",
+    ])
+    store = SnapshotStore(open_source(path), chunksize=2)
+    snapshot = store.get()
+
+    assert store.last_error is None
+    assert snapshot.row_count == 4
+    assert snapshot.index.staff == ("Alice", "Bob", "Carol", "Unspecified")
+    assert snapshot.index.regions == ("KSA", "UAE", "Unspecified Region")
+
+
+def test_tabs_with_and_without_blank_fills_concatenate(write_csv):
+    first = write_csv(["UAE,Alice,Tower,Tower,Engineer,"], "t1.csv")
+    second = write_csv(["KSA,,Desert,Desert,Surveyor,"], "t2.csv")
+    store = SnapshotStore(open_source(f"{first},{second}"), chunksize=50_000)
+    snapshot = store.get()
+
+    assert store.last_error is None
+    assert snapshot.index.staff == ("Alice", "Unspecified")
+
+
+def test_chunked_build_equals_unchunked(write_csv):
+    source = open_source(write_csv(SAMPLE_ROWS + ["uae,alice,Tower,Tower,Engineer,"] + SAMPLE_ROWS[:3]))
+    raw = source.fetch().raw
+    whole = build_snapshot(source, raw)
+
+    for chunksize in (1, 3, 50_000):
+        chunked = build_snapshot(source, raw, chunksize=chunksize)
+        pd.testing.assert_frame_equal(chunked.frame().astype(object), whole.frame().astype(object))
+        assert chunked.index._tables == whole.index._tables
+        assert chunked.quality == whole.quality
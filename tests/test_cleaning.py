@@ -0,0 +1,50 @@
+import io
+
+import pandas as pd
+
+from recruitment.cleaning import CATEGORY_COLUMNS, clean_data
+from tests.conftest import HEADER, SAMPLE_ROWS
+
+
+def baseline_load_data(df):
+    """The app's original load_data(), minus the download."""
+    df.columns = [str(c).strip() for c in df.columns]
+    for col, fill in (("Region", "Unspecified Region"), ("Staff_Lead", "Unspecified"), ("Role", "Unspecified")):
+        df[col] = df[col].fillna(fill)
+        df.loc[df[col].str.strip() == "", col] = fill
+    df["Project"] = df["Project"].fillna("")
+    df["Sub_Division"] = df["Sub_Division"].fillna("")
+    both_empty = (df["Project"] == "") & (df["Sub_Division"] == "")
+    df.loc[both_empty, "Project"] = "Unspecified"
+    df.loc[both_empty, "Sub_Division"] = "Unspecified"
+    sub_empty = (df["Project"] != "") & (df["Sub_Division"] == "")
+    df.loc[sub_empty, "Sub_Division"] = df.loc[sub_empty, "Project"]
+    project_empty = (df["Sub_Division"] != "") & (df["Project"] == "")
+    df.loc[project_empty, "Project"] = df.loc[project_empty, "Sub_Division"]
+    for col in df.columns:
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+
+def read(rows):
+    return pd.read_csv(io.StringIO("\n".join([HEADER, *rows])), dtype=str)
+
+
+def test_clean_data_matches_the_original_load_data():
+    expected = baseline_load_data(read(SAMPLE_ROWS))
+    cleaned = clean_data(read(SAMPLE_ROWS))
+
+    assert list(cleaned.columns) == list(expected.columns)
+    for col in CATEGORY_COLUMNS:
+        assert isinstance(cleaned[col].dtype, pd.CategoricalDtype)
+        assert list(cleaned[col].astype(object)) == list(expected[col])
+    pd.testing.assert_series_equal(cleaned["Notes"].astype(object), expected["Notes"].astype(object))
+
+
+def test_headers_are_stripped_without_touching_the_input():
+    df = pd.read_csv(io.StringIO(" Region ,Staff_Lead,Project,Sub_Division,Role\nUAE,Alice,Tower,,Engineer\n"), dtype=str)
+    before = df.copy()
+
+    assert list(clean_data(df).columns) == ["Region", "Staff_Lead", "Project", "Sub_Division", "Role"]
+    assert list(df.columns) == [" Region ", "Staff_Lead", "Project", "Sub_Division", "Role"]
+    pd.testing.assert_frame_equal(df, before)
@@ -0,0 +1,42 @@
+import io
+
+import pandas as pd
+
+from recruitment.cleaning import clean_data
+from recruitment.diff import diff_frames
+from tests.conftest import HEADER
+
+ROWS = [
+    "UAE,Alice,Tower,Tower,Engineer,",
+    "UAE,Bob,Metro,Line 1,Driver,",
+    "KSA,Bob,Desert,Desert,Surveyor,",
+]
+
+
+def frame(rows):
+    return clean_data(pd.read_csv(io.StringIO("\n".join([HEADER, *rows])), dtype=str, keep_default_na=False))
+
+
+def test_only_keys_missing_before_are_new():
+    diff = diff_frames(frame(ROWS), frame(ROWS + [
+        "UAE,Alice,Tower,Tower,Welder,",
+        "Oman,Zed,Port,Port,Crane,",
+    ]))
+
+    assert diff.affected_regions == {"UAE", "Oman"}
+    assert diff.new_regions == {"Oman"}
+    assert diff.new_staff == {"Zed"}
+    assert diff.new_projects == {("Oman", "Port")}
+    assert diff.new_roles == {("UAE", "Tower", "Tower", "Welder"), ("Oman", "Port", "Port", "Crane")}
+    assert diff.new_placements == {("Zed", "Oman", "Port", "Port")}
+    assert ("Alice", "UAE", "Tower", "Tower", "Welder") in diff.new_staff_roles
+
+
+def test_edited_row_adds_no_new_keys():
+    edited = ROWS[:1] + ["UAE,Bob,Metro,Line 1,Driver,edited"] + ROWS[2:]
+    diff = diff_frames(frame(ROWS), frame(edited))
+
+    assert (diff.added_count, diff.removed_count) == (1, 1)
+    assert diff.affected_regions == {"UAE"}
+    assert not (diff.new_regions or diff.new_staff or diff.new_projects or diff.new_subdivisions
+                or diff.new_roles or diff.new_placements or diff.new_staff_roles)
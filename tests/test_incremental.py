@@ -0,0 +1,45 @@
+import pandas as pd
+
+from recruitment.cube import RecruitmentCube
+from recruitment.index import build_index
+from recruitment.snapshot import build_snapshot
+from recruitment.sources import open_source
+from tests.conftest import SAMPLE_ROWS
+
+# An edited row, a removed row, a new region and a staff member moving region
+EDITED_ROWS = [
+    "UAE,Alice,Tower,Tower,Senior Engineer,",
+    *SAMPLE_ROWS[1:4],
+    *SAMPLE_ROWS[5:9],
+    "KSA,Dana,Metro,Line 3,Welder,",
+    "Oman,Erin,Port,Port,Crane Operator,",
+]
+
+
+def snapshots(write_csv):
+    before = open_source(write_csv(SAMPLE_ROWS, "before.csv"))
+    after = open_source(write_csv(EDITED_ROWS, "after.csv"))
+    previous = build_snapshot(before, before.fetch().raw)
+    return previous, build_snapshot(after, after.fetch().raw, previous=previous)
+
+
+def test_index_with_partitions_equals_a_full_rebuild(write_csv):
+    previous, current = snapshots(write_csv)
+
+    assert current.diff is not None
+    assert current.index._tables == build_index(current.frame())._tables
+    assert "Oman" in current.index.regions
+    assert current.index.staff_regions("Dana") == ("KSA",)
+
+
+def test_cube_with_regions_equals_a_full_rebuild(write_csv):
+    previous, current = snapshots(write_csv)
+    updated = RecruitmentCube.from_frame(previous.frame()).with_regions(
+        current.frame(), current.diff.affected_regions
+    )
+    rebuilt = RecruitmentCube.from_frame(current.frame())
+
+    assert updated.totals() == rebuilt.totals()
+    for name in ("by_region", "by_staff", "by_project", "manager_required"):
+        pd.testing.assert_frame_equal(getattr(updated, name)(), getattr(rebuilt, name)())
+    pd.testing.assert_frame_equal(updated.by_project("UAE"), rebuilt.by_project("UAE"))
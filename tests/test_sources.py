@@ -0,0 +1,77 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from recruitment.sources import GoogleSheetSource
+from recruitment.store import SnapshotStore
+from tests.conftest import HEADER, SAMPLE_ROWS
+
+
+class SheetHandler(BaseHTTPRequestHandler):
+    """Serves server.body as CSV, with server.etag as its ETag when set."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.headers.get("If-None-Match"))
+        if server.etag and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def sheet_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SheetHandler)
+    server.body = "\n".join([HEADER, *SAMPLE_ROWS]).encode()
+    server.etag = '"v1"'
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def store_for(server):
+    return SnapshotStore(GoogleSheetSource(f"http://127.0.0.1:{server.server_address[1]}/export"))
+
+
+def test_not_modified_keeps_the_snapshot(sheet_server):
+    store = store_for(sheet_server)
+    snapshot = store.get()
+
+    assert store.refresh() is False
+    assert store.get() is snapshot
+    assert sheet_server.requests == [None, '"v1"']
+    assert store.checked_at is not None and store.last_error is None
+
+
+def test_same_bytes_keep_the_snapshot(sheet_server):
+    sheet_server.etag = None
+    store = store_for(sheet_server)
+    snapshot = store.get()
+
+    assert store.refresh() is False
+    assert store.get() is snapshot
+
+
+def test_changed_sheet_swaps_the_snapshot(sheet_server):
+    store = store_for(sheet_server)
+    snapshot = store.get()
+    sheet_server.body += b"\nOman,Erin,Port,Port,Crane Operator,"
+    sheet_server.etag = '"v2"'
+
+    assert store.refresh() is True
+    assert store.get() is not snapshot
+    assert "Oman" in store.get().index.regions
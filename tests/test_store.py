@@ -0,0 +1,52 @@
+from recruitment import store as store_module
+from recruitment.sources import open_source
+from recruitment.store import SnapshotStore
+
+ROWS = [
+    "UAE,Alice,Tower,Tower,Engineer,",
+    "U.A.E.,Bob,Metro,Line 1,Driver,",
+]
+
+
+def regions(store):
+    return tuple(sorted(store.get().frame()["Region"].unique()))
+
+
+def test_changed_aliases_rebuild_the_disk_cache(write_csv, tmp_path):
+    source = write_csv(ROWS)
+    cache_dir = str(tmp_path / "cache")
+    first = SnapshotStore(open_source(source), cache_dir=cache_dir)
+    assert regions(first) == ("U.A.E.", "UAE")
+
+    # A restart with an alias for the odd spelling, same unchanged sheet
+    second = SnapshotStore(open_source(source), cache_dir=cache_dir, aliases={"Region": {"U.A.E.": "UAE"}})
+    assert regions(second) == ("UAE",)
+    second.refresh()
+    assert regions(second) == ("UAE",)
+    assert second.get().version != first.get().version
+
+    # ... and the copy it wrote is served to the next restart with the same aliases
+    third = SnapshotStore(open_source(source), cache_dir=cache_dir, aliases={"Region": {"U.A.E.": "UAE"}})
+    assert third.get().version == second.get().version
+    assert regions(third) == ("UAE",)
+
+
+def test_only_new_versions_are_written_to_disk(write_csv, tmp_path, monkeypatch):
+    saved = []
+    save_snapshot = store_module.save_snapshot
+
+    def record(directory, snapshot, *args):
+        saved.append(snapshot)
+        return save_snapshot(directory, snapshot, *args)
+
+    monkeypatch.setattr(store_module, "save_snapshot", record)
+    source = write_csv(ROWS)
+    store = SnapshotStore(open_source(source), cache_dir=str(tmp_path / "cache"))
+    first = store.get()
+
+    assert store.refresh() is False
+    assert saved == [first]
+
+    write_csv(ROWS + ["KSA,Carol,Desert,Desert,Surveyor,"])
+    assert store.refresh() is True
+    assert saved == [first, store.get()]
@@ -0,0 +1 @@
+"""Developer tools (benchmarks, synthetic data). Run with ``python -m tools.<name>``."""
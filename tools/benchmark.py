@@ -0,0 +1,174 @@
+"""
+Micro-benchmarks for the data pipeline and the per-view data preparation.
+
+Generates synthetic sheets (see tools.synthetic_sheet) as local CSV files, so
+it runs fully offline, and times each stage at each size. Every stage reports
+the best wall time over --repeat runs and the peak traced memory of one
+extra run.
+
+    python -m tools.benchmark                          # 1k, 10k, 100k rows
+    python -m tools.benchmark --sizes 1000 1000000 --output after.json
+    python -m tools.benchmark --compare before.json    # ratios vs an old run
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from recruitment.cube import RecruitmentCube
+from recruitment.helpers import format_staff_for_display, sort_general_list, sort_staff_list
+from recruitment.index import build_index
+from recruitment.search import SearchIndex
+from recruitment.snapshot import build_snapshot, load_data, load_data_chunked
+from recruitment.sources import CsvFileSource
+from recruitment.viewmodels import build_region_view, build_staff_view
+from tools.synthetic_sheet import write_sheet
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+CHUNK_ROWS = 50_000
+
+# Short, common, multi-term and misspelt queries against the synthetic sheet
+SEARCH_QUERIES = ["a", "role 12", "staff 3", "saudi", "projet 42", "sub 1 qatar"]
+
+
+def measure(func, repeat):
+    """Returns (best_seconds, peak_bytes, result) for func()."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+# --- View Data Preparation ---
+# Region and Staff views are built by recruitment.viewmodels; Summary slices the cube.
+
+def prepare_summary_view(cube):
+    return cube.totals(), cube.by_region(), cube.by_staff(), cube.by_project(None), cube.manager_required()
+
+
+def run_size(rows, repeat, workdir, seed):
+    path = os.path.join(workdir, f"sheet_{rows}.csv")
+    write_sheet(path, rows, seed)
+    source = CsvFileSource(path)
+    raw = source.fetch().raw
+
+    results = {}
+
+    def record(stage, func):
+        seconds, peak, value = measure(func, repeat)
+        results[stage] = {"seconds": seconds, "peak_bytes": peak}
+        return value
+
+    df = record("load_data", lambda: load_data(source, raw))
+    record("load_data_chunked", lambda: load_data_chunked(source, raw, CHUNK_ROWS))
+    index = record("build_index", lambda: build_index(df))
+
+    # A refresh where one row changed: full rebuild vs diff and partial rebuild
+    edited = raw.rstrip(b"\r\n") + b" (edited)\n"
+    previous = build_snapshot(source, raw)
+    record("refresh_full", lambda: build_snapshot(source, edited))
+    record("refresh_incremental", lambda: build_snapshot(source, edited, previous=previous))
+
+    staff_column = list(df["Staff_Lead"].unique())
+    project_column = list(df["Project"].unique())
+    record("sort_staff_list", lambda: sort_staff_list(staff_column))
+    record("sort_general_list", lambda: sort_general_list(project_column))
+    record("format_staff_for_display", lambda: [
+        format_staff_for_display(index.region_staff(region)) for region in index.regions
+    ])
+
+    pairs = [(region, project) for region in index.regions for project in index.region_projects(region)]
+    record("is_global_simple_project", lambda: [index.is_simple(region, project) for region, project in pairs])
+
+    record("region_view", lambda: [build_region_view(index, region) for region in index.regions])
+    record("staff_view", lambda: [build_staff_view(index, staff) for staff in index.staff])
+
+    cube = record("build_cube", lambda: RecruitmentCube.from_frame(df))
+    # A fresh cube per run, so the memoised slices are really computed
+    record("summary_view", lambda: prepare_summary_view(RecruitmentCube(cube.cells)))
+
+    search_index = record("build_search_index", lambda: SearchIndex.from_index(index))
+    record("search", lambda: [search_index.search(query) for query in SEARCH_QUERIES])
+
+    return {
+        "rows": rows,
+        "csv_bytes": len(raw),
+        "regions": len(index.regions),
+        "staff": len(index.staff),
+        "projects": len(pairs),
+        "stages": results,
+    }
+
+
+def print_table(report, baseline=None):
+    old = {}
+    if baseline:
+        old = {run["rows"]: run["stages"] for run in baseline["runs"]}
+
+    header = f"{'rows':>9}  {'stage':<26}{'time (ms)':>12}{'peak (MB)':>12}"
+    if old:
+        header += f"{'vs base':>10}"
+    print(header)
+    for run in report["runs"]:
+        for stage, values in run["stages"].items():
+            line = (f"{run['rows']:>9}  {stage:<26}"
+                    f"{values['seconds'] * 1000:>12.2f}{values['peak_bytes'] / 1e6:>12.2f}")
+            before = old.get(run["rows"], {}).get(stage)
+            if before and before["seconds"]:
+                line += f"{values['seconds'] / before['seconds']:>9.2f}x"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recruitment data pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="sheet sizes in rows (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON report")
+    parser.add_argument("--compare", help="earlier JSON report to compare timings against")
+    args = parser.parse_args()
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="xad-bench-") as workdir:
+        for rows in args.sizes:
+            report["runs"].append(run_size(rows, args.repeat, workdir, args.seed))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+    print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Load test for the Streamlit app: many simulated browser sessions at once.
+
+Starts the app on a synthetic local sheet (see tools.synthetic_sheet) and
+opens websocket sessions that speak Streamlit's own protocol, the way the
+browser does. Each session walks realistic click paths in a loop:
+
+    Home -> Region -> Project -> Sub-division
+    Home -> Staff -> complex sub-division
+    sidebar Quick Jump to a region, then to a staff member
+
+Every rerun is timed from the request to the server's script_finished
+message. For each concurrency level the report gives p50/p95/p99 rerun
+latency, reruns per second, errors and the peak RSS of the app process.
+
+    python -m tools.loadtest                                # 1, 5, 10, 25 sessions
+    python -m tools.loadtest --sessions 1 10 50 --rows 100000 --duration 30
+    python -m tools.loadtest --url http://localhost:8501 --pid 1234   # an app already running
+
+All sessions run on one asyncio loop in this process; at very high
+concurrency, check that this process is not the one saturating a core.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+from tools.synthetic_sheet import write_sheet
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+DEFAULT_SESSIONS = [1, 5, 10, 25]
+RERUN_TIMEOUT = 60  # seconds
+
+
+class Widget:
+    __slots__ = ("id", "kind", "key", "label", "options", "fragment_id")
+
+    def __init__(self, element, kind, fragment_id):
+        proto = getattr(element, kind)
+        self.id = proto.id
+        self.kind = kind
+        # Widget ids look like "$$ID-<hash>-<user key or None>"
+        self.key = proto.id.split("-", 2)[-1]
+        self.label = proto.label
+        self.options = tuple(proto.options) if kind == "selectbox" else ()
+        self.fragment_id = fragment_id
+
+
+class SimSession:
+    """One simulated browser tab. Keeps the widgets of its last run so it can click them."""
+
+    def __init__(self, url, rng):
+        self.url = url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self.rng = rng
+        self.query_string = ""
+        self.page_script_hash = ""
+        self.widgets = {}
+        self.latencies = []
+        self.first_element_latency = None
+        self.json_bodies = []
+        self.errors = 0
+        self._ws = None
+
+    async def connect(self, query_string=""):
+        self._ws = await websockets.connect(self.url, max_size=None)
+        self.query_string = query_string
+        await self.rerun()
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def rerun(self, widget_state=None, fragment_id=""):
+        msg = BackMsg()
+        rerun = msg.rerun_script
+        rerun.query_string = self.query_string
+        rerun.page_script_hash = self.page_script_hash
+        if widget_state is not None:
+            rerun.widget_states.widgets.append(widget_state)
+        if fragment_id:
+            rerun.fragment_id = fragment_id
+        else:
+            self.widgets = {}
+            self.json_bodies = []
+
+        start = time.perf_counter()
+        self.first_element_latency = None
+        await self._ws.send(msg.SerializeToString())
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self._ws.recv(), RERUN_TIMEOUT))
+            kind = forward.WhichOneof("type")
+            if kind == "delta":
+                if self.first_element_latency is None:
+                    self.first_element_latency = time.perf_counter() - start
+                self._on_delta(forward.delta)
+            elif kind == "new_session":
+                self.page_script_hash = forward.new_session.main_script_hash
+            elif kind == "page_info_changed":
+                self.query_string = forward.page_info_changed.query_string
+            elif kind == "script_finished":
+                break
+        self.latencies.append(time.perf_counter() - start)
+
+    def _on_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind in ("button", "selectbox"):
+            widget = Widget(element, kind, delta.fragment_id)
+            self.widgets[widget.key if widget.key != "None" else widget.label] = widget
+        elif kind == "json":
+            self.json_bodies.append(element.json.body)
+        elif kind == "exception":
+            self.errors += 1
+
+    def _pick(self, *prefixes):
+        found = [w for key, w in self.widgets.items() if key.startswith(prefixes)]
+        return self.rng.choice(found) if found else None
+
+    async def click(self, widget):
+        if widget is None:
+            return
+        await self.rerun(WidgetState(id=widget.id, trigger_value=True), widget.fragment_id)
+
+    async def select(self, widget):
+        if widget is None or len(widget.options) < 2:
+            return
+        choice = self.rng.choice(widget.options[1:])  # skip the "Select..." placeholder
+        await self.rerun(WidgetState(id=widget.id, string_value=choice), widget.fragment_id)
+
+    # --- Click Paths ---
+    async def region_path(self):
+        await self.click(self.widgets.get("🏠 Home"))
+        await self.click(self._pick("home_reg_"))
+        await self.click(self._pick("reg_proj_"))
+        await self.click(self._pick("reg_sub_"))
+
+    async def staff_path(self):
+        await self.click(self.widgets.get("🏠 Home"))
+        await self.click(self._pick("home_staff_"))
+        await self.click(self._pick("staff_complex_") or self._pick("staff_simple_"))
+
+    async def quick_jump_path(self):
+        await self.select(self.widgets.get("nav_reg_jump"))
+        await self.select(self.widgets.get("nav_staff_jump"))
+
+    async def run_until(self, deadline):
+        paths = (self.region_path, self.staff_path, self.quick_jump_path)
+        while time.monotonic() < deadline:
+            try:
+                await self.rng.choice(paths)()
+            except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                self.errors += 1
+                await self.close()
+                await self.connect()
+
+
+def read_rss(pid):
+    """Resident set size of a process in bytes (Linux /proc), or None."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+async def sample_rss(pid, peak, stop):
+    while not stop.is_set():
+        rss = read_rss(pid)
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        await asyncio.sleep(0.2)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_level(url, pid, sessions, duration, seed):
+    peak = [read_rss(pid) or 0] if pid else [0]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, peak, stop)) if pid else None
+
+    clients = [SimSession(url, random.Random(seed + i)) for i in range(sessions)]
+    await asyncio.gather(*(client.connect() for client in clients))
+    for client in clients:
+        client.latencies.clear()  # the first page load is not part of the steady state
+
+    start = time.monotonic()
+    await asyncio.gather(*(client.run_until(start + duration) for client in clients))
+    elapsed = time.monotonic() - start
+    await asyncio.gather(*(client.close() for client in clients))
+
+    stop.set()
+    if sampler is not None:
+        await sampler
+
+    latencies = [latency for client in clients for latency in client.latencies]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "reruns_per_second": len(latencies) / elapsed,
+        "p50_ms": (percentile(latencies, 50) or 0) * 1000,
+        "p95_ms": (percentile(latencies, 95) or 0) * 1000,
+        "p99_ms": (percentile(latencies, 99) or 0) * 1000,
+        "errors": sum(client.errors for client in clients),
+        "peak_rss_bytes": peak[0] or None,
+    }
+
+
+def wait_for_health(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url.rstrip("/") + "/_stcore/health", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"app at {url} did not become healthy within {timeout}s")
+
+
+def start_app(sheet_path, port, workdir):
+    env = dict(
+        os.environ,
+        XAD_DATA_SOURCE=sheet_path,
+        XAD_CACHE_DIR=os.path.join(workdir, "cache"),
+        XAD_REFRESH_INTERVAL="0",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH,
+         "--server.headless", "true", "--server.port", str(port),
+         "--browser.gatherUsageStats", "false"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def print_header():
+    print(f"{'sessions':>9}{'reruns':>9}{'rerun/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'errors':>8}{'RSS MB':>9}")
+
+
+def print_row(r):
+    rss = f"{r['peak_rss_bytes'] / 1e6:>9.1f}" if r["peak_rss_bytes"] else f"{'-':>9}"
+    print(f"{r['sessions']:>9}{r['reruns']:>9}{r['reruns_per_second']:>10.1f}{r['p50_ms']:>10.1f}"
+          f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['errors']:>8}{rss}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with simulated sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS,
+                        help="concurrency levels to run, in order (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per concurrency level")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the synthetic sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8599, help="port for the app this tool starts")
+    parser.add_argument("--url", help="test an app that is already running instead of starting one")
+    parser.add_argument("--pid", type=int, help="process to measure RSS of, with --url")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="xad-loadtest-") as workdir:
+        app = None
+        url, pid = args.url, args.pid
+        if url is None:
+            sheet_path = os.path.join(workdir, "sheet.csv")
+            write_sheet(sheet_path, args.rows, args.seed)
+            app = start_app(sheet_path, args.port, workdir)
+            url, pid = f"http://127.0.0.1:{args.port}", app.pid
+        try:
+            wait_for_health(url)
+            print_header()
+            results = []
+            for sessions in args.sessions:
+                results.append(asyncio.run(run_level(url, pid, sessions, args.duration, args.seed)))
+                print_row(results[-1])
+        finally:
+            if app is not None:
+                app.terminate()
+                app.wait(timeout=10)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "duration": args.duration, "url": args.url, "levels": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Warm-up and latency probe for the Streamlit app, run by the keep-alive workflow.
+
+A plain HTTP GET only returns Streamlit's static index page: it neither loads
+the data nor runs the script. The probe instead talks to the app the way a
+browser does (see tools.loadtest) and measures
+
+    ready_ms           until /_stcore/health answers "ok"
+    warmup_ms          a ?warmup=1 session: loads the snapshot and builds the
+                       cached views (the app's own report is kept under "warmup")
+    first_element_ms   a fresh Home session: until the first element arrives
+    first_render_ms    ... until the script run finishes
+    region_ms          clicking the first region on Home
+    staff_ms           clicking the first staff member on Home
+
+The result is printed as one JSON object. The probe exits non-zero when the
+app is not ready, a run raises, a metric is over its --max-* limit, or a metric
+is more than --tolerance times the same metric in --baseline.
+
+    python -m tools.probe https://xad-recruitment-details.streamlit.app
+    python -m tools.probe --local --rows 100000          # app started here on a synthetic sheet
+    python -m tools.probe URL --baseline probe.jsonl --output probe.jsonl
+
+Hosts may serve Streamlit's endpoints under a path prefix (Community Cloud
+uses /~/+/), so the probe tries each of APP_PREFIXES under the given URL and
+uses the first whose /_stcore/health answers "ok"; the one it used is
+reported as app_url.
+
+--output appends one JSON line per run, and --baseline compares against the
+last run in a file that passed, so the same file can serve as both and a slow
+run never becomes the baseline for the next one.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+
+from tools.loadtest import SimSession, start_app
+from tools.synthetic_sheet import write_sheet
+
+TIMED_METRICS = ("ready_ms", "warmup_ms", "first_element_ms", "first_render_ms", "region_ms", "staff_ms")
+
+# Differences below this are noise, whatever the tolerance says
+BASELINE_SLACK_MS = 250
+
+# Path prefixes the Streamlit endpoints may live under, tried in order
+APP_PREFIXES = ("", "/~/+")
+
+
+def wait_for_app(url, timeout):
+    """
+    Polls /_stcore/health under each of APP_PREFIXES until one answers "ok"
+    and returns the URL the app's endpoints live under. A host that answers
+    every path with its own page does not count as ready.
+    """
+    candidates = [url.rstrip("/") + prefix for prefix in APP_PREFIXES]
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for base in candidates:
+            try:
+                with urllib.request.urlopen(base + "/_stcore/health", timeout=5) as response:
+                    if response.status == 200 and response.read(16).strip() == b"ok":
+                        return base
+            except OSError:
+                pass
+        time.sleep(0.5)
+    raise RuntimeError(f"no Streamlit health endpoint under {url} within {timeout:.0f}s")
+
+
+async def probe_session(url, warmup=True):
+    """Runs the warm-up, first-render and navigation steps; returns their metrics."""
+    result = {"errors": 0}
+
+    if warmup:
+        session = SimSession(url, random.Random(0))
+        await session.connect("warmup=1")
+        await session.close()
+        result["warmup_ms"] = session.latencies[-1] * 1000
+        result["warmup"] = json.loads(session.json_bodies[0]) if session.json_bodies else None
+        result["errors"] += session.errors
+
+    session = SimSession(url, random.Random(0))
+    await session.connect()
+    result["first_element_ms"] = (session.first_element_latency or 0) * 1000
+    result["first_render_ms"] = session.latencies[-1] * 1000
+
+    for metric, prefix in (("region_ms", "home_reg_"), ("staff_ms", "home_staff_")):
+        await session.click(session.widgets.get("🏠 Home"))
+        buttons = [w for key, w in session.widgets.items() if key.startswith(prefix)]
+        if buttons:
+            await session.click(buttons[0])
+            result[metric] = session.latencies[-1] * 1000
+    await session.close()
+    result["errors"] += session.errors
+    return result
+
+
+def load_baseline(path):
+    """The last run in a JSON-lines file that passed, or None if there is none yet."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return None
+    passed = [run for run in runs if not run.get("failures")]
+    return passed[-1] if passed else None
+
+
+def check(result, limits, baseline, tolerance):
+    """Human-readable reasons the probe failed; empty when it passed."""
+    failures = []
+    warmup = result.get("warmup")
+    if warmup is not None and not warmup.get("ready"):
+        failures.append(f"warm-up reported no data: {warmup.get('error')}")
+    if result["errors"]:
+        failures.append(f"{result['errors']} script run(s) raised an exception")
+    for metric in TIMED_METRICS:
+        value = result.get(metric)
+        if value is None:
+            continue
+        limit = limits.get(metric)
+        if limit is not None and value > limit:
+            failures.append(f"{metric} {value:.0f} ms is over the limit of {limit:.0f} ms")
+        previous = (baseline or {}).get(metric)
+        if previous is not None and value > previous * tolerance + BASELINE_SLACK_MS:
+            failures.append(f"{metric} {value:.0f} ms regressed from {previous:.0f} ms in the baseline")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm up the app and measure time-to-ready and first render.")
+    parser.add_argument("url", nargs="?", help="app to probe; a /~/+ path prefix is found on its own")
+    parser.add_argument("--local", action="store_true", help="start the app here on a synthetic sheet and probe it")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the synthetic sheet, with --local")
+    parser.add_argument("--port", type=int, default=8598, help="port for the app started by --local")
+    parser.add_argument("--no-warmup", action="store_true", help="skip the ?warmup=1 session (measures a cold render)")
+    parser.add_argument("--timeout", type=float, default=180, help="seconds to wait for the app to become ready")
+    parser.add_argument("--max-ready-ms", type=float)
+    parser.add_argument("--max-warmup-ms", type=float)
+    parser.add_argument("--max-first-render-ms", type=float)
+    parser.add_argument("--max-page-ms", type=float, help="limit for region_ms and staff_ms")
+    parser.add_argument("--baseline", help="JSON-lines file of earlier runs; the last passing one is compared against")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="allowed slowdown factor against the baseline (default: %(default)s)")
+    parser.add_argument("--output", help="append the result to this JSON-lines file")
+    args = parser.parse_args()
+    if (args.url is None) == (not args.local):
+        parser.error("give either a URL or --local")
+
+    limits = {
+        "ready_ms": args.max_ready_ms,
+        "warmup_ms": args.max_warmup_ms,
+        "first_render_ms": args.max_first_render_ms,
+        "region_ms": args.max_page_ms,
+        "staff_ms": args.max_page_ms,
+    }
+    baseline = load_baseline(args.baseline) if args.baseline else None
+
+    with tempfile.TemporaryDirectory(prefix="xad-probe-") as workdir:
+        app = None
+        url = args.url
+        if args.local:
+            sheet_path = os.path.join(workdir, "sheet.csv")
+            write_sheet(sheet_path, args.rows, 0)
+            url = f"http://127.0.0.1:{args.port}"
+        result = {"url": url, "started_at": time.time()}
+        try:
+            start = time.perf_counter()
+            if args.local:
+                app = start_app(sheet_path, args.port, workdir)
+            app_url = wait_for_app(url, args.timeout)
+            result["ready_ms"] = (time.perf_counter() - start) * 1000
+            result["app_url"] = app_url
+            result.update(asyncio.run(probe_session(app_url, warmup=not args.no_warmup)))
+        except (RuntimeError, OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            if app is not None:
+                app.terminate()
+                app.wait(timeout=10)
+
+    failures = [result["error"]] if "error" in result else check(result, limits, baseline, args.tolerance)
+    result["failures"] = failures
+    print(json.dumps(result, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result) + "\n")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Synthetic recruitment sheets for benchmarks and offline runs.
+
+The generated sheet has the same columns as the real one and mimics its
+shape: a few large regions and a blank-region tail, skewed staff workloads,
+a share of "Manager Required" and blank (-> "Unspecified") staff, simple
+projects whose only sub-division is the project itself, blank
+Project/Sub_Division cells, and stray whitespace.
+
+    python -m tools.synthetic_sheet 100000 sheet.csv [--seed 1]
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["Region", "Staff_Lead", "Project", "Sub_Division", "Role", "Notes"]
+
+REGIONS = ["UAE", "KSA", "UK", "Qatar", ""]
+REGION_WEIGHTS = [0.42, 0.33, 0.15, 0.06, 0.04]
+
+ROLE_TITLES = [
+    "Site Engineer", "Project Manager", "Quantity Surveyor", "Architect", "Planner",
+    "HSE Officer", "Document Controller", "MEP Engineer", "Structural Engineer",
+    "Foreman", "Procurement Officer", "QA/QC Inspector", "Cost Controller",
+    "Design Manager", "Commercial Manager", "Land Surveyor", "BIM Coordinator",
+    "Electrical Engineer", "Mechanical Engineer", "Contracts Administrator",
+]
+SENIORITY = ["", "Senior ", "Junior ", "Lead ", "Assistant "]
+
+
+def _zipf_weights(n, s=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / weights.sum()
+
+
+def generate_sheet(rows, seed=0):
+    """Returns a raw (uncleaned) sheet of `rows` rows as a DataFrame of strings."""
+    rng = np.random.default_rng(seed)
+
+    n_staff = max(5, rows // 2000)
+    n_projects = max(3, rows // 400)
+    staff_names = np.array([f"Recruiter {i:04d}" for i in range(n_staff)], dtype=object)
+    roles = np.array([level + title for title in ROLE_TITLES for level in SENIORITY], dtype=object)
+
+    regions = rng.choice(np.array(REGIONS, dtype=object), size=rows, p=REGION_WEIGHTS)
+
+    # Skewed workloads, plus the special values the app pins to top/bottom.
+    staff = staff_names[rng.choice(n_staff, size=rows, p=_zipf_weights(n_staff))]
+    special = rng.random(rows)
+    staff[special < 0.05] = "Manager Required"
+    staff[(special >= 0.05) & (special < 0.07)] = ""
+
+    project_ids = rng.choice(n_projects, size=rows, p=_zipf_weights(n_projects, 0.8))
+    projects = np.array([f"Project {i:05d}" for i in range(n_projects)], dtype=object)[project_ids]
+
+    # About 40% of projects are "simple" (sub-division == project); the rest
+    # have a few sub-divisions each.
+    is_simple = rng.random(n_projects) < 0.4
+    sub_counts = rng.integers(2, 9, size=n_projects)
+    sub_numbers = rng.integers(0, 1 << 30, size=rows) % sub_counts[project_ids]
+    subdivs = np.where(
+        is_simple[project_ids],
+        projects,
+        np.char.add(np.char.add(projects.astype(str), " - Phase "), sub_numbers.astype(str)).astype(object),
+    )
+
+    # Blank cells exercise the Project/Sub_Division inference rules.
+    blank = rng.random(rows)
+    subdivs[(blank < 0.10) & is_simple[project_ids]] = ""
+    projects[(blank >= 0.10) & (blank < 0.13)] = ""
+    both = (blank >= 0.13) & (blank < 0.14)
+    projects[both] = ""
+    subdivs[both] = ""
+
+    role_values = roles[rng.integers(0, len(roles), size=rows)]
+    role_values[rng.random(rows) < 0.02] = ""
+
+    # Hand-maintained sheets have stray whitespace.
+    padded = rng.random(rows) < 0.03
+    regions[padded] = regions[padded] + " "
+
+    notes = np.full(rows, "", dtype=object)
+    notes[rng.random(rows) < 0.1] = "Urgent"
+
+    return pd.DataFrame({
+        "Region": regions,
+        "Staff_Lead": staff,
+        "Project": projects,
+        "Sub_Division": subdivs,
+        "Role": role_values,
+        "Notes": notes,
+    }, columns=COLUMNS)
+
+
+def write_sheet(path, rows, seed=0):
+    """Writes a synthetic sheet to a .csv or .xlsx file and returns the path."""
+    df = generate_sheet(rows, seed)
+    if str(path).lower().endswith(".xlsx"):
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic recruitment sheet.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_sheet(args.path, args.rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()